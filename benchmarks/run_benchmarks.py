@@ -0,0 +1,317 @@
+"""
+Scaling benchmarks for choicepy.
+
+Times the profile generators, the voting rules behind Profile.elect, the
+ranking distances, the profile enumeration and the permutation helpers over
+a sweep of candidate and voter counts, and records the peak memory of every
+case with tracemalloc.
+
+Usage (from the root of the repository):
+
+    python benchmarks/run_benchmarks.py                  # full sweep
+    python benchmarks/run_benchmarks.py --quick          # small sizes only
+    python benchmarks/run_benchmarks.py --filter borda   # matching cases
+    python benchmarks/run_benchmarks.py --save results.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+
+With --compare, every case is reported next to the baseline and the script
+exits with status 1 if a case got slower than --tolerance times its
+baseline time.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+import numpy as np  # noqa: E402
+
+import choicepy  # noqa: E402
+
+CANDIDATE_COUNTS = (3, 6, 9, 12)
+VOTER_COUNTS = (10, 1000, 100000, 1000000)
+QUICK_CANDIDATE_COUNTS = (3, 6)
+QUICK_VOTER_COUNTS = (10, 1000)
+
+# Largest number of permutations enumerated by a single case
+MAX_PERMUTATIONS = 40320
+# The enumeration cases are exponential in both counts and get their own
+# (num_candidates, num_voters) sizes; --quick runs the first two
+ENUMERATION_SIZES = ((3, 2), (3, 3), (4, 2), (3, 4), (4, 3))
+PERMUTATION_SIZES = ((3, 1), (6, 1), (8, 1))
+
+# Fast cases are run until they took MIN_TOTAL_SECONDS in total, so that
+# their best time is not noise, unless they already ran MAX_RUNS times or
+# their setups made the case take MAX_CASE_SECONDS
+MIN_TOTAL_SECONDS = 0.2
+MAX_RUNS = 1000
+MAX_CASE_SECONDS = 2.0
+VOTER_PERMUTATION_SIZES = ((3, 4), (3, 6), (3, 8), (5, 8))
+
+
+def make_profile(num_candidates, num_voters):
+    profile = choicepy.Profile()
+    profile.gen_uniform_voters(num_candidates, num_voters, rng=0)
+    return profile
+
+
+def generator_case(method_name, *args):
+    def setup(num_candidates, num_voters):
+        profile = choicepy.Profile()
+        method = getattr(profile, method_name)
+        return lambda: method(num_candidates, num_voters, *args, rng=0)
+    return setup
+
+
+def rule_case(rule):
+    def setup(num_candidates, num_voters):
+        voter_array = make_profile(num_candidates,
+                                   num_voters).get_voter_array()
+        profile = choicepy.Profile()
+        # A fresh profile per run, so that no cached statistic is reused
+        profile.set_voter_array(voter_array, num_candidates)
+        return lambda: profile.elect(rule)
+    return setup
+
+
+def ranking_distance_case(method):
+    def setup(num_candidates, num_voters):
+        rankings = make_profile(num_candidates, num_voters).voters
+        reference = rankings[0]
+        return lambda: [choicepy.ranking_distance(ranking, reference, method)
+                        for ranking in rankings]
+    return setup
+
+
+def ranking_distances_case(method):
+    def setup(num_candidates, num_voters):
+        rankings = make_profile(num_candidates, num_voters).get_voter_array()
+        return lambda: choicepy.ranking_distances(rankings, rankings[0],
+                                                  method)
+    return setup
+
+
+def all_profiles_setup(num_candidates, num_voters):
+    candidates = choicepy.get_lexicographic_list(num_candidates)
+    return lambda: choicepy.all_profiles(candidates, num_voters)
+
+
+def permutation_array_setup(num_candidates, num_voters):
+    def run():
+        choicepy.permutation_array.cache_clear()
+        return choicepy.permutation_array(num_candidates)
+    return run
+
+
+def all_preferences_setup(num_candidates, num_voters):
+    candidates = choicepy.get_lexicographic_list(num_candidates)
+    return lambda: choicepy.all_preferences(candidates)
+
+
+def candidate_permutations_setup(num_candidates, num_voters):
+    profile = make_profile(num_candidates, num_voters)
+    return lambda: profile.create_candidate_permutations()
+
+
+def voter_permutations_setup(num_candidates, num_voters):
+    profile = make_profile(num_candidates, num_voters)
+    return lambda: profile.create_voter_permutations()
+
+
+def factorial(n):
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
+
+def everywhere(num_candidates, num_voters):
+    return True
+
+
+def small_rankings(num_candidates, num_voters):
+    return num_voters <= 100000
+
+
+def few_candidate_permutations(num_candidates, num_voters):
+    return factorial(num_candidates) * num_voters <= MAX_PERMUTATIONS
+
+
+def get_cases():
+    """
+    Returns the benchmark cases as (name, setup, sizes) where setup(
+    num_candidates, num_voters) returns the function to time, and sizes
+    is either a function telling whether a size of the sweep is run or a
+    tuple of (num_candidates, num_voters) sizes.
+    """
+    cases = [
+        ("gen_uniform_voters",
+         generator_case("gen_uniform_voters"), everywhere),
+        ("gen_mallows_voters",
+         generator_case("gen_mallows_voters", 0.8), everywhere),
+        ("gen_mallows_voters[transformed]",
+         generator_case("gen_mallows_voters", 0.8, 1), everywhere),
+        ("gen_mistaken_truth_voters",
+         generator_case("gen_mistaken_truth_voters", 1.0), everywhere),
+        ("gen_impartial_anonymous_voters",
+         generator_case("gen_impartial_anonymous_voters"), everywhere),
+        ("gen_urn_voters",
+         generator_case("gen_urn_voters", 0.5), everywhere),
+        ("gen_single_peaked_voters",
+         generator_case("gen_single_peaked_voters"), everywhere),
+        ("gen_euclidean_voters",
+         generator_case("gen_euclidean_voters", 2), everywhere),
+    ]
+    cases += [("elect[" + rule + "]", rule_case(rule), everywhere)
+              for rule in choicepy.ELECTION_RULES]
+    cases += [("ranking_distance[" + method + "]",
+               ranking_distance_case(method), small_rankings)
+              for method in sorted(choicepy.RANKING_DISTANCE_METHODS)]
+    cases += [("ranking_distances[" + method + "]",
+               ranking_distances_case(method), everywhere)
+              for method in sorted(choicepy.RANKING_DISTANCE_METHODS)]
+    cases += [
+        ("all_profiles", all_profiles_setup, ENUMERATION_SIZES),
+        ("permutation_array", permutation_array_setup, PERMUTATION_SIZES),
+        ("all_preferences", all_preferences_setup, PERMUTATION_SIZES),
+        ("create_candidate_permutations", candidate_permutations_setup,
+         few_candidate_permutations),
+        ("create_voter_permutations", voter_permutations_setup,
+         VOTER_PERMUTATION_SIZES),
+    ]
+    return cases
+
+
+def measure(setup, num_candidates, num_voters, repeat):
+    """
+    Returns the best wall time of at least repeat runs, each on a fresh
+    setup, and the peak memory allocated by one more run.
+    """
+    times = []
+    case_start = time.perf_counter()
+    while len(times) < repeat or (
+            sum(times) < MIN_TOTAL_SECONDS and len(times) < MAX_RUNS
+            and time.perf_counter() - case_start < MAX_CASE_SECONDS):
+        run = setup(num_candidates, num_voters)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    run = setup(num_candidates, num_voters)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak_bytes
+
+
+def run_benchmarks(candidate_counts, voter_counts, name_filter=None,
+                   repeat=3, quick=False):
+    results = {}
+    for name, setup, sizes in get_cases():
+        if name_filter and name_filter not in name:
+            continue
+        if callable(sizes):
+            sizes = [(num_candidates, num_voters)
+                     for num_candidates in candidate_counts
+                     for num_voters in voter_counts
+                     if sizes(num_candidates, num_voters)]
+        elif quick:
+            sizes = sizes[:2]
+
+        for num_candidates, num_voters in sizes:
+            key = "{}[c={},v={}]".format(name, num_candidates, num_voters)
+            seconds, peak_bytes = measure(setup, num_candidates, num_voters,
+                                          repeat)
+            results[key] = {"seconds": seconds, "peak_bytes": peak_bytes}
+            print("{:<60} {:>12.6f} s {:>14,d} B".format(key, seconds,
+                                                          peak_bytes),
+                  flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    """
+    Prints every result next to its baseline and returns the keys of the
+    cases slower than tolerance times their baseline time, ignoring cases
+    that take less than min_seconds.
+    """
+    regressions = []
+    print()
+    print("{:<60} {:>12} {:>12} {:>8}".format("case", "baseline s",
+                                              "current s", "ratio"))
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result["seconds"] / max(baseline[key]["seconds"], 1e-9)
+        flag = ""
+        if ratio > tolerance and result["seconds"] >= min_seconds:
+            regressions.append(key)
+            flag = " slower"
+        print("{:<60} {:>12.6f} {:>12.6f} {:>8.2f}{}".format(
+            key, baseline[key]["seconds"], result["seconds"], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--quick", action="store_true",
+                        help="run the small sizes only")
+    parser.add_argument("--filter", default=None,
+                        help="run the cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per case (the best one counts)")
+    parser.add_argument("--save", default=None,
+                        help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None,
+                        help="compare with the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.001,
+                        help="cases faster than this are never regressions")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        candidate_counts = QUICK_CANDIDATE_COUNTS
+        voter_counts = QUICK_VOTER_COUNTS
+    else:
+        candidate_counts = CANDIDATE_COUNTS
+        voter_counts = VOTER_COUNTS
+
+    results = run_benchmarks(candidate_counts, voter_counts, args.filter,
+                             args.repeat, args.quick)
+
+    if args.save:
+        with open(args.save, "w") as results_file:
+            json.dump({"environment": {
+                           "python": platform.python_version(),
+                           "numpy": np.__version__,
+                           "machine": platform.machine(),
+                           "processor": platform.processor()},
+                       "results": results},
+                      results_file, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.tolerance,
+                              args.min_seconds)
+        if regressions:
+            print()
+            print("{} cases slower than {} times the baseline".format(
+                len(regressions), args.tolerance))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
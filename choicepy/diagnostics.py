@@ -0,0 +1,251 @@
+"""
+Opt-in instrumentation of the profile methods and generators.
+"""
+
+import atexit
+import contextlib
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Functions recorded by Instrumentation besides the public methods of the
+# profile classes and the module-level generators (sample_* and gen_*)
+INSTRUMENTED_CLASSES = ("Profile", "AnonymousProfile", "IncrementalProfile")
+INSTRUMENTED_FUNCTIONS = ("filter_unique", "filter_unique_profile",
+                          "ranking_distance", "ranking_distances",
+                          "all_profiles", "pairwise_majority_matrix",
+                          "position_histogram", "kemeny_consensus",
+                          "elect_batch", "estimate_mallows", "read_preflib",
+                          "write_preflib", "save_profile", "load_profile")
+
+
+def get_package_modules():
+    """
+    get_package_modules()
+
+    Loads every public name of the package, and with them all submodules,
+    and returns the package and its submodules.
+    """
+    package = importlib.import_module(__package__)
+    for name in package.__all__:
+        getattr(package, name)
+    return [module for module_name, module in sorted(sys.modules.items())
+            if module_name == __package__
+            or module_name.startswith(__package__ + ".")]
+
+
+class Instrumentation:
+    """
+    A class used to record how often the public methods of the profile
+    classes and the module-level generators are called, how long they take
+    and how much memory they allocate.
+
+    Enabling the instrumentation replaces these functions by recording
+    wrappers, and disabling it puts the original functions back, so the
+    instrumentation costs nothing while it is disabled. Times and
+    allocations are inclusive: a method that calls another recorded method
+    also counts the time and memory of that call.
+
+    Use the module-level instance through the instrument() context manager,
+    or set the environment variable CHOICEPY_PROFILE before importing
+    choicepy: any value but "0" enables the instrumentation for the whole
+    run, and a value other than "1" is a file name that the report is
+    written to as JSON when the interpreter exits.
+
+    Attributes
+    ----------
+    records: dict
+        [calls, seconds, allocated bytes] of every recorded function
+
+    Methods
+    -------
+    is_enabled()
+    enable(memory=True)
+    disable()
+    reset()
+    report()
+    write_report(path)
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.memory = False
+        self.started_tracemalloc = False
+        self.originals = []
+        # [traced memory at the start, highest peak seen] of every
+        # recorded call in progress
+        self.call_stack = []
+
+    def is_enabled(self):
+        return bool(self.originals)
+
+    def enable(self, memory=True):
+        """
+        Starts recording. With memory=True, the memory allocated by every
+        call is traced with tracemalloc (which slows the calls down): the
+        peak of the traced memory during the call above its start, or the
+        memory still held after the call before Python 3.9.
+        """
+        if self.is_enabled():
+            return
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+
+        modules = get_package_modules()
+        for class_name in INSTRUMENTED_CLASSES:
+            profile_class = getattr(modules[0], class_name)
+            for name, attribute in list(vars(profile_class).items()):
+                if name.startswith("_"):
+                    continue
+                qualified_name = class_name + "." + name
+                if isinstance(attribute, classmethod):
+                    wrapper = classmethod(self.wrap(qualified_name,
+                                                    attribute.__func__))
+                elif callable(attribute):
+                    wrapper = self.wrap(qualified_name, attribute)
+                else:
+                    continue
+                self.originals.append((profile_class, name, attribute))
+                setattr(profile_class, name, wrapper)
+
+        # The package and the submodules that import a function all refer
+        # to it, and all of them get the same wrapper
+        wrappers = {}
+        for module in modules:
+            for name, attribute in list(vars(module).items()):
+                if callable(attribute) and not isinstance(attribute, type) \
+                        and getattr(attribute, "__module__", "").startswith(
+                            __package__) \
+                        and (name.startswith(("sample_", "gen_"))
+                             or name in INSTRUMENTED_FUNCTIONS):
+                    if id(attribute) not in wrappers:
+                        wrappers[id(attribute)] = self.wrap(name, attribute)
+                    self.originals.append((module, name, attribute))
+                    setattr(module, name, wrappers[id(attribute)])
+
+    def disable(self):
+        """
+        Stops recording and puts the original functions back. The records
+        are kept.
+        """
+        for owner, name, attribute in reversed(self.originals):
+            setattr(owner, name, attribute)
+        self.originals = []
+        self.call_stack = []
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+
+    def reset(self):
+        self.records = {}
+
+    def wrap(self, name, function):
+        """
+        Returns a wrapper of function that records its calls under name.
+        """
+        @functools.wraps(function)
+        def recorded_function(*args, **kwargs):
+            record = self.records.setdefault(name, [0, 0.0, 0])
+            if self.memory and tracemalloc.is_tracing():
+                self.enter_call()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record[1] += time.perf_counter() - start
+                record[0] += 1
+                if self.memory and self.call_stack:
+                    record[2] += self.exit_call()
+        return recorded_function
+
+    def enter_call(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, "reset_peak"):
+            if self.call_stack:
+                self.call_stack[-1][1] = max(self.call_stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        self.call_stack.append([current, current])
+
+    def exit_call(self):
+        start, peak = self.call_stack.pop()
+        current, traced_peak = tracemalloc.get_traced_memory()
+        if not hasattr(tracemalloc, "reset_peak"):
+            return max(0, current - start)
+        peak = max(peak, traced_peak)
+        if self.call_stack:
+            # The caller's peak includes the peak of this call
+            self.call_stack[-1][1] = max(self.call_stack[-1][1], peak)
+        return peak - start
+
+    def report(self):
+        """
+        Returns the records as a list of dicts with the keys "name",
+        "calls", "seconds" and "allocated_bytes", the slowest first.
+        """
+        report = [{"name": name, "calls": calls, "seconds": seconds,
+                   "allocated_bytes": allocated_bytes}
+                  for name, (calls, seconds, allocated_bytes)
+                  in self.records.items()]
+        return sorted(report, key=lambda r: r["seconds"], reverse=True)
+
+    def write_report(self, path):
+        """
+        Writes report() to a JSON file.
+        """
+        with open(path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=1)
+
+
+instrumentation = Instrumentation()
+
+
+@contextlib.contextmanager
+def instrument(memory=True, reset=True):
+    """
+    instrument(memory=True, reset=True)
+
+    Context manager that records the calls of the profile methods and the
+    generators inside its block (see Instrumentation) and yields the
+    module-level Instrumentation instance. With reset, the records of
+    earlier blocks are discarded first, unless the block is nested in one
+    that is still recording.
+
+    Example
+    -------
+    with choicepy.instrument() as recorder:
+        profile = choicepy.Profile()
+        profile.gen_mallows_voters(10, 100000, 0.8)
+        profile.elect_many(["borda", "condorcet"])
+    recorder.report()
+    """
+    was_enabled = instrumentation.is_enabled()
+    if reset and not was_enabled:
+        instrumentation.reset()
+    instrumentation.enable(memory)
+    try:
+        yield instrumentation
+    finally:
+        if not was_enabled:
+            instrumentation.disable()
+
+
+def instrument_from_environment():
+    """
+    instrument_from_environment()
+
+    Enables the instrumentation if the environment variable
+    CHOICEPY_PROFILE is set to a value other than "0", and writes the
+    report at exit to the file it names if it is not "1" (see
+    Instrumentation).
+    """
+    value = os.environ.get("CHOICEPY_PROFILE", "0")
+    if value != "0":
+        instrumentation.enable()
+        if value != "1":
+            atexit.register(instrumentation.write_report, value)
@@ -0,0 +1,189 @@
+"""
+Distances between rankings.
+"""
+
+import numpy as np
+
+
+RANKING_DISTANCE_METHODS = {"kendalltau", "footrule", "spearman", "cayley"}
+
+
+def check_distance_method(method):
+    if method not in RANKING_DISTANCE_METHODS:
+        raise ValueError(""" methods: please choose correct measure. \n
+                         Available measures: """
+                         + str(RANKING_DISTANCE_METHODS))
+
+
+def count_inversions(sequence):
+    """
+    count_inversions(sequence)
+
+    Counts the pairs i < j with sequence[i] > sequence[j] by merge sort in
+    O(n log n).
+
+    Parameters
+    ----------
+    sequence: list of comparable elements
+
+    Returns
+    -------
+    integer
+    """
+    inversions = 0
+    runs = [[element] for element in sequence]
+    while len(runs) > 1:
+        merged_runs = []
+        for r in range(0, len(runs) - 1, 2):
+            left, right = runs[r], runs[r + 1]
+            merged = []
+            i = j = 0
+            while i < len(left) and j < len(right):
+                if right[j] < left[i]:
+                    merged.append(right[j])
+                    inversions += len(left) - i
+                    j += 1
+                else:
+                    merged.append(left[i])
+                    i += 1
+            merged.extend(left[i:])
+            merged.extend(right[j:])
+            merged_runs.append(merged)
+        if len(runs) % 2:
+            merged_runs.append(runs[-1])
+        runs = merged_runs
+    return inversions
+
+
+def ranking_distance(rnkA, rnkB, method="kendalltau"):
+    """
+    ranking_distance(rnkA, rnkB, method="kendalltau")
+
+    Calculates the distance between two rankings of the same candidates.
+
+    Parameters
+    ----------
+    rnkA, rnkB: list or numpy array
+        rankings from the most to the least preferred candidate; the
+        candidates can be names or integer indices
+    method: str
+        "kendalltau": number of candidate pairs ordered differently
+        "footrule": Spearman's footrule, sum of the absolute differences of
+                    the rank positions
+        "spearman": Spearman's rho distance, sum of the squared differences
+                    of the rank positions
+        "cayley": minimum number of swaps that turn one ranking into the
+                  other
+
+    Returns
+    -------
+    integer
+
+    Example
+    -------
+    ranking_distance(["a", "b", "c"], ["b", "c", "a"])  # returns 2
+    """
+    check_distance_method(method)
+
+    # permutation[i] is the position in rnkA of the candidate ranked i-th
+    # in rnkB
+    positions_in_a = {c: i for i, c in enumerate(np.asarray(rnkA).tolist())}
+    permutation = [positions_in_a[c] for c in np.asarray(rnkB).tolist()]
+
+    if method == "kendalltau":
+        return count_inversions(permutation)
+
+    if method == "footrule":
+        return sum(abs(p - i) for i, p in enumerate(permutation))
+
+    if method == "spearman":
+        return sum((p - i) ** 2 for i, p in enumerate(permutation))
+
+    if method == "cayley":
+        visited = [False] * len(permutation)
+        cycles = 0
+        for i in range(len(permutation)):
+            if not visited[i]:
+                cycles += 1
+                while not visited[i]:
+                    visited[i] = True
+                    i = permutation[i]
+        return len(permutation) - cycles
+
+
+def ranking_distances(rankings, reference, method="kendalltau"):
+    """
+    ranking_distances(rankings, reference, method="kendalltau")
+
+    Batched form of ranking_distance: calculates the distance of every
+    ranking in a 2-D array to one reference ranking.
+
+    Parameters
+    ----------
+    rankings: array-like of shape (num_rankings, num_candidates)
+        one ranking per row; the candidates can be names or integer indices
+    reference: array-like of shape (num_candidates,)
+        the reference ranking
+    method: str
+        one of "kendalltau", "footrule", "spearman", "cayley"
+        (see ranking_distance)
+
+    Returns
+    -------
+    numpy array of shape (num_rankings,)
+    """
+    check_distance_method(method)
+
+    rankings = np.asarray(rankings)
+    reference = np.asarray(reference)
+    num_rankings, num_candidates = np.shape(rankings)
+
+    # permutation[r, i] is the position in the reference of the candidate
+    # ranked i-th in ranking r
+    reference_order = np.argsort(reference, kind="stable")
+    permutation = reference_order[np.searchsorted(reference[reference_order],
+                                                  rankings)]
+
+    if method == "kendalltau":
+        distances = np.zeros(num_rankings, dtype=np.int64)
+        for i in range(num_candidates - 1):
+            distances += np.count_nonzero(
+                permutation[:, [i]] > permutation[:, i + 1:], axis=1)
+        return distances
+
+    displacement = permutation - np.arange(num_candidates)
+
+    if method == "footrule":
+        return np.abs(displacement).sum(axis=1)
+
+    if method == "spearman":
+        return (displacement ** 2).sum(axis=1)
+
+    if method == "cayley":
+        # After the doubling steps every element is labelled by the
+        # smallest element of its cycle
+        cycle_minimum = np.tile(np.arange(num_candidates), (num_rankings, 1))
+        jump = permutation
+        for _ in range(max(1, int(num_candidates).bit_length())):
+            cycle_minimum = np.minimum(
+                cycle_minimum,
+                np.take_along_axis(cycle_minimum, jump, axis=1))
+            jump = np.take_along_axis(jump, jump, axis=1)
+        cycles = np.count_nonzero(cycle_minimum == np.arange(num_candidates),
+                                  axis=1)
+        return num_candidates - cycles
+
+
+# kendall tau
+# stackexchange
+# https://stats.stackexchange.com/questions/168602/whats-the-kendall-taus-distance-between-these-2-rankings
+
+
+def calculate_rank(vector):
+    a = {}
+    rank = 0
+    for num in sorted(vector):
+        if num not in a:
+            a[num] = rank
+            rank = rank + 1
+    return [a[i] for i in vector]
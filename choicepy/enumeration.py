@@ -0,0 +1,352 @@
+"""
+Integer encodings of preferences and enumeration of profiles.
+"""
+
+import functools
+import itertools
+import math
+
+import numpy as np
+
+
+@functools.lru_cache(maxsize=16)
+def permutation_array(n):
+    """
+    permutation_array(n)
+
+    Returns all permutations of range(n) as a read-only array of shape
+    (n!, n), in the order of itertools.permutations (lexicographic).
+    """
+    permutations = np.array(list(itertools.permutations(range(n))),
+                            dtype=np.intp).reshape(-1, n)
+    permutations.flags.writeable = False
+    return permutations
+
+
+def permutation_ranks(permutations):
+    """
+    permutation_ranks(permutations)
+
+    Returns the index of every permutation (row) of range(n) in
+    permutation_array(n), computed from its Lehmer code.
+    """
+    permutations = np.asarray(permutations)
+    n = permutations.shape[-1]
+    ranks = np.zeros(permutations.shape[:-1], dtype=np.int64)
+    for k in range(n - 1):
+        smaller_later = np.count_nonzero(
+            permutations[..., k + 1:] < permutations[..., [k]], axis=-1)
+        ranks += smaller_later * math.factorial(n - 1 - k)
+    return ranks
+
+
+def count_profiles(candidates, num_voters):
+    """
+    Returns the number of profiles of num_voters voters over the candidates,
+    i.e. the length of all_profiles(candidates, num_voters)
+    """
+    return math.factorial(len(candidates)) ** num_voters
+
+
+def iter_profile_chunks(candidates, num_voters, chunk_size=10000, start=0,
+                        stop=None):
+    """
+    iter_profile_chunks(candidates, num_voters, chunk_size=10000, start=0,
+                        stop=None)
+
+    Yields the profiles of all_profiles(candidates, num_voters) with index
+    start, ..., stop - 1 as integer arrays of at most chunk_size profiles.
+
+    Parameters
+    ----------
+    candidates: list
+        list of candidates
+    num_voters: int
+        number of voters
+    chunk_size: int
+        maximal number of profiles per chunk
+    start: int
+        index of the first profile, to resume an enumeration
+    stop: int, optional
+        index after the last profile; all remaining profiles by default
+
+    Yields
+    ------
+    numpy array of shape (chunk, num_voters, num_candidates)
+        every voter's preference as indices into sorted(candidates)
+        (see Profile.set_voter_array)
+    """
+    num_profiles = count_profiles(candidates, num_voters)
+    if num_profiles > np.iinfo(np.int64).max:
+        raise ValueError("Too many profiles to enumerate by index")
+    if stop is None or stop > num_profiles:
+        stop = num_profiles
+
+    candidate_index = {c: i for i, c in enumerate(sorted(candidates))}
+    to_sorted = np.array([candidate_index[c] for c in candidates],
+                         dtype=index_dtype(len(candidates)))
+    preference_array = to_sorted[permutation_array(len(candidates))]
+    num_preferences = len(preference_array)
+
+    for chunk_start in range(start, stop, chunk_size):
+        profile_indices = np.arange(chunk_start,
+                                    min(chunk_start + chunk_size, stop),
+                                    dtype=np.int64)
+        # The first voter is the most significant digit, as in
+        # itertools.product
+        preference_indices = np.empty((len(profile_indices), num_voters),
+                                      dtype=np.int64)
+        for v in range(num_voters - 1, -1, -1):
+            profile_indices, preference_indices[:, v] = np.divmod(
+                profile_indices, num_preferences)
+        yield preference_array[preference_indices]
+
+
+def iter_profiles(candidates, num_voters, start=0, stop=None):
+    """
+    iter_profiles(candidates, num_voters, start=0, stop=None)
+
+    Yields the profiles of all_profiles(candidates, num_voters) with index
+    start, ..., stop - 1 one at a time, so that memory use does not grow
+    with the number of profiles.
+    """
+    # profile imports this module
+    from .profile import Profile
+
+    for chunk in iter_profile_chunks(candidates, num_voters, start=start,
+                                     stop=stop):
+        for voter_array in chunk:
+            profile = Profile()
+            profile.set_voter_array(voter_array, candidates)
+            yield profile
+
+
+def shard_profile_indices(candidates, num_voters, num_shards, start=0,
+                          stop=None):
+    """
+    shard_profile_indices(candidates, num_voters, num_shards, start=0,
+                          stop=None)
+
+    Splits the profile indices start, ..., stop - 1 into num_shards
+    contiguous ranges of nearly equal length, e.g. to hand them to
+    iter_profiles or iter_profile_chunks on different workers.
+
+    Returns
+    -------
+    list of (start, stop) tuples
+
+    Example
+    -------
+    shard_profile_indices(list("ab"), 3, 3)  # returns [(0, 3), (3, 6), (6, 8)]
+    """
+    if stop is None:
+        stop = count_profiles(candidates, num_voters)
+    size, remainder = divmod(stop - start, num_shards)
+    shards = []
+    for shard in range(num_shards):
+        shard_stop = start + size + (shard < remainder)
+        shards.append((start, shard_stop))
+        start = shard_stop
+    return shards
+
+
+def all_profiles(candidates, num_voters):
+    return list(iter_profiles(candidates, num_voters))
+
+
+def hashable_key(element):
+    """
+    hashable_key(element)
+
+    Returns an immutable, hashable key for a ranking, a list of rankings or
+    a profile: nested lists, tuples and numpy arrays become nested tuples,
+    profiles (anything with a get_key method) use Profile.get_key(). Equal
+    elements get equal keys.
+
+    Example
+    -------
+    hashable_key([["a", "b"], ["b", "a"]])  # returns (('a', 'b'), ('b', 'a'))
+    """
+    if hasattr(element, "get_key"):
+        return element.get_key()
+    if isinstance(element, np.ndarray):
+        element = element.tolist()
+    if isinstance(element, (list, tuple)):
+        return tuple(hashable_key(e) for e in element)
+    return element
+
+
+def ballot_codes(voter_array, num_candidates):
+    """
+    ballot_codes(voter_array, num_candidates)
+
+    Encodes every preference (last axis) of an integer voter array as one
+    integer, in base num_candidates. Codes compare like the preferences
+    compare lexicographically.
+    """
+    if num_candidates ** num_candidates > np.iinfo(np.int64).max:
+        raise ValueError("Too many candidates to encode preferences")
+    weights = num_candidates ** np.arange(num_candidates - 1, -1, -1,
+                                          dtype=np.int64)
+    return np.asarray(voter_array, dtype=np.int64) @ weights
+
+
+def decode_ballots(codes, num_candidates):
+    """
+    decode_ballots(codes, num_candidates)
+
+    Inverse of ballot_codes.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    weights = num_candidates ** np.arange(num_candidates - 1, -1, -1,
+                                          dtype=np.int64)
+    return ((codes[..., np.newaxis] // weights) % num_candidates).astype(
+        index_dtype(num_candidates))
+
+
+def count_arrangements(multiplicities):
+    """
+    Returns the number of distinct orders of a multiset with the given
+    multiplicities.
+    """
+    arrangements = math.factorial(sum(multiplicities))
+    for m in multiplicities:
+        arrangements //= math.factorial(m)
+    return arrangements
+
+
+def iter_orbit_representatives(candidates, num_voters, chunk_size=10000):
+    """
+    iter_orbit_representatives(candidates, num_voters, chunk_size=10000)
+
+    Yields one representative of every class of profiles that are equal up
+    to reordering the voters (anonymity) and relabelling the candidates
+    (neutrality), together with the number of profiles in the class. Every
+    representative is its own canonical form (see Profile.canonical_form),
+    and the class sizes add up to count_profiles(candidates, num_voters).
+
+    Only multisets of preferences that contain the preference
+    sorted(candidates) are examined, since every class contains such a
+    profile.
+
+    Yields
+    ------
+    (Profile, int)
+    """
+    # profile imports this module
+    from .profile import Profile
+
+    num_candidates = len(candidates)
+    permutations = permutation_array(num_candidates)
+    num_preferences = len(permutations)
+
+    # composition[s, b] is the index of preference b relabelled by s
+    composition = np.stack([permutation_ranks(relabelling[permutations])
+                            for relabelling in permutations])
+    voter_arrangements = {}
+
+    multisets = itertools.combinations_with_replacement(
+        range(num_preferences), num_voters - 1)
+    while True:
+        chunk = np.array(list(itertools.islice(multisets, chunk_size)),
+                         dtype=np.int64).reshape(-1, num_voters - 1)
+        if not len(chunk):
+            return
+        chunk = np.hstack([np.zeros((len(chunk), 1), dtype=np.int64),
+                           chunk])
+
+        # relabelled[m, s] is multiset m relabelled by s, sorted
+        relabelled = np.sort(composition[:, chunk].transpose(1, 0, 2),
+                             axis=2)
+        difference = relabelled != chunk[:, np.newaxis, :]
+        first_difference = np.argmax(difference, axis=2)[..., np.newaxis]
+        smaller = np.any(difference, axis=2) & (
+            np.take_along_axis(relabelled, first_difference, axis=2)
+            < np.take_along_axis(np.broadcast_to(chunk[:, np.newaxis, :],
+                                                 relabelled.shape),
+                                 first_difference, axis=2))[..., 0]
+        stabilizer_sizes = np.count_nonzero(~np.any(difference, axis=2),
+                                            axis=1)
+
+        for m in np.flatnonzero(~np.any(smaller, axis=1)):
+            multiset = chunk[m]
+            multiplicities = tuple(np.unique(multiset,
+                                             return_counts=True)[1].tolist())
+            if multiplicities not in voter_arrangements:
+                voter_arrangements[multiplicities] = count_arrangements(
+                    multiplicities)
+            orbit_size = num_preferences // int(stabilizer_sizes[m]) \
+                * voter_arrangements[multiplicities]
+
+            profile = Profile()
+            profile.set_voter_array(permutations[multiset], candidates)
+            yield profile, orbit_size
+
+
+def filter_unique(voterlist):
+    unique_voter_list = []
+    seen = set()
+
+    for v in voterlist:
+        key = hashable_key(v)
+        if key not in seen:
+            seen.add(key)
+            unique_voter_list.append(v)
+
+    return unique_voter_list
+
+
+def append_to_profile_list(profile, profile_list):
+    for p in profile_list:
+        if p == profile:
+            return
+
+    profile_list.append(profile)
+
+
+def filter_unique_profile(profile_list):
+    new_profile_list = []
+    seen = set()
+
+    for p in profile_list:
+        key = p.get_key()
+        if key not in seen:
+            seen.add(key)
+            new_profile_list.append(p)
+
+    return new_profile_list
+
+
+def remove_if_exists(profile, profile_list):
+    try:
+        profile_list.remove(profile)
+    except TypeError:
+        pass
+
+
+def print_profile_list(profile_list):
+    for p in profile_list:
+        p.print_full()
+
+
+def index_dtype(num_candidates):
+    """
+    index_dtype(num_candidates)
+
+    Returns the smallest unsigned integer type that can hold the index of
+    every candidate.
+
+    Parameters
+    ----------
+    num_candidates: int
+        number of candidates
+
+    Returns
+    -------
+    numpy dtype
+    """
+    if num_candidates <= np.iinfo(np.uint8).max + 1:
+        return np.dtype(np.uint8)
+    if num_candidates <= np.iinfo(np.uint16).max + 1:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
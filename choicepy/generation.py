@@ -0,0 +1,633 @@
+"""
+Statistical cultures: samplers of preferences and the Mallows model.
+"""
+
+import functools
+import math
+
+import numpy as np
+
+from .utils import all_preferences, convert_condensed
+from .distances import ranking_distance, ranking_distances
+from .enumeration import index_dtype
+from .rules import kemeny_cost
+
+
+def gen_mallows_culture_old(true_ordering,
+                            sigma,
+                            distance_weight=1,
+                            concentrate=False):
+
+    preferences = all_preferences(true_ordering, concentrate=concentrate)
+    kemeny_distances = np.array([ranking_distance(p, true_ordering)
+                                 for p in preferences])
+    kemeny_distances_weighted = kemeny_distances ** distance_weight
+    probabilities = (1 / (kemeny_distances_weighted *
+                          sum(kemeny_distances_weighted))) * (1 - sigma)
+    probabilities[
+        kemeny_distances_weighted == 0] = sigma  # replace the zero distance
+    # ordering with sigma (assuming there is only one)
+    return [list(preferences), list(probabilities)]
+
+
+def get_mallows_normalization_constant(number_of_alternatives,
+                                       dispersion_parameter):
+    # Normalization constant is Z.
+    normalization_constant = 1
+    for j in range(1, number_of_alternatives):
+        dispersionoverdistance = [dispersion_parameter ** j
+                                  for j in range(0, j + 1)]
+        sum_of_dispersionoverdistance = sum(dispersionoverdistance)
+        normalization_constant *= sum_of_dispersionoverdistance
+    return normalization_constant
+
+
+# def get_transformed_mallows_normalization_constant(number_of_alternatives,
+#                                                    dispersion_parameter,
+#                                                    transformation_parameter):
+#    # Normalization constant is Z.
+#    normalization_constant = 1
+#    for j in range(1,number_of_alternatives+1):
+#        dispersionoverdistance = [dispersion_parameter ** (j **
+#        np.exp(transformation_parameter)) for j in range(0,j)]
+#        sum_of_dispersionoverdistance = sum(dispersionoverdistance)
+#        normalization_constant *= sum_of_dispersionoverdistance
+#    return normalization_constant
+
+def get_transformed_mallows_normalization_constant(dispersion_parameter,
+                                                   transformation_parameter,
+                                                   kemeny_distances):
+    normalization_constant = sum(
+        dispersion_parameter ** (k ** np.exp(transformation_parameter))
+        for k in kemeny_distances)
+    return normalization_constant
+
+
+def mallows_pdf(distance, number_of_alternatives, dispersion_parameter):
+    likelihood = dispersion_parameter ** distance
+    probability = likelihood / get_mallows_normalization_constant(
+        number_of_alternatives,
+        dispersion_parameter)
+
+    return probability
+
+
+def transformed_mallows_pdf(distance, number_of_alternatives,
+                            dispersion_parameter, transformation_parameter,
+                            kemeny_distances):
+
+    likelihood = dispersion_parameter ** (distance **
+                                          np.exp(transformation_parameter))
+
+    normalization_constant = get_transformed_mallows_normalization_constant(
+        dispersion_parameter,
+        transformation_parameter,
+        kemeny_distances)
+
+    probability = likelihood / normalization_constant
+
+    return probability
+
+
+def gen_mallows_culture(reference_rank,
+                        dispersion_parameter,
+                        concentrate=False):
+
+    number_of_alternatives = len(reference_rank)
+    preferences = all_preferences(reference_rank)
+    kemeny_distances = ranking_distances(preferences, reference_rank)
+    if concentrate:
+        preferences = convert_condensed(preferences)
+    probabilities = [mallows_pdf(d,
+                                 number_of_alternatives,
+                                 dispersion_parameter)
+                     for d in kemeny_distances]
+
+    return [list(preferences), list(probabilities), list(kemeny_distances)]
+
+
+def gen_trans_mallows_culture(reference_rank,
+                              dispersion_parameter,
+                              transformation_parameter=0,
+                              concentrate=False):
+
+    preferences = all_preferences(reference_rank)
+    kemeny_distances = ranking_distances(preferences, reference_rank)
+    if concentrate:
+        preferences = convert_condensed(preferences)
+
+    # Same as transformed_mallows_pdf for every ranking, with the
+    # normalization constant computed once
+    likelihoods = dispersion_parameter ** (kemeny_distances
+                                           ** np.exp(transformation_parameter))
+    probabilities = likelihoods / np.sum(likelihoods)
+
+    return [list(preferences), list(probabilities), list(kemeny_distances)]
+
+
+def get_rng(rng=None):
+    """
+    get_rng(rng=None)
+
+    Returns the random number generator used by the generators:
+    None gives the numpy.random module, whose functions draw from the
+    global numpy random state (numpy.random.seed applies), an int or a
+    numpy.random.SeedSequence seeds a new numpy.random.Generator, and a
+    Generator or RandomState is used as is.
+    """
+    if rng is None or rng is np.random:
+        return np.random
+    if isinstance(rng, (np.random.Generator, np.random.RandomState)):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def sample_mallows_insertion_codes(num_voters, number_of_alternatives,
+                                   dispersion_parameter, rng=None):
+    """
+    sample_mallows_insertion_codes(num_voters, number_of_alternatives,
+                                   dispersion_parameter, rng=None)
+
+    Draws the insertion codes of the repeated insertion model of the
+    Mallows model for all voters at once.
+
+    Code [v, i] is the number of the alternatives 0, ..., i-1 of the
+    reference ranking that voter v ranks below alternative i. It takes the
+    value k in {0, ..., i} with probability proportional to
+    dispersion_parameter ** k; the Kendall tau distance of the voter to the
+    reference ranking is the sum of its codes.
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    support = np.arange(1, number_of_alternatives + 1)  # i + 1 values
+    uniform = get_rng(rng).random((num_voters, number_of_alternatives))
+
+    if dispersion_parameter == 0:
+        return np.zeros((num_voters, number_of_alternatives), dtype=np.int64)
+
+    if dispersion_parameter == 1:
+        return np.floor(uniform * support).astype(np.int64)
+
+    # Above 1 the distribution is mirrored: k ~ phi**k is i - k ~ (1/phi)**k
+    mirrored = dispersion_parameter > 1
+    log_dispersion = -abs(np.log(dispersion_parameter))
+
+    # Inverse of the truncated geometric distribution function
+    # P(K <= k) = (1 - phi**(k + 1)) / (1 - phi**(i + 1))
+    total_mass = -np.expm1(support * log_dispersion)
+    codes = np.ceil(np.log1p(-uniform * total_mass) / log_dispersion) - 1
+    codes = np.clip(codes, 0, support - 1).astype(np.int64)
+
+    if mirrored:
+        codes = support - 1 - codes
+    return codes
+
+
+def insertion_codes_to_rankings(codes, chunk_size=16384):
+    """
+    insertion_codes_to_rankings(codes, chunk_size=16384)
+
+    Builds the rankings described by insertion codes (see
+    sample_mallows_insertion_codes): alternative i of the reference ranking
+    is inserted into the ranking of the alternatives 0, ..., i-1 with
+    codes[v, i] of them below it.
+
+    Inserting alternative i shifts the positions of the i alternatives
+    before it, so the time grows with num_voters * number_of_alternatives
+    ** 2 (the memory with num_voters * number_of_alternatives). The voters
+    are decoded in chunks of chunk_size, whose positions stay in the CPU
+    cache over all insertion steps.
+
+    Returns
+    -------
+    numpy array of the shape of codes where every row lists the indices of
+    the reference alternatives from the most to the least preferred
+    """
+    num_voters, number_of_alternatives = np.shape(codes)
+    dtype = index_dtype(number_of_alternatives)
+    alternatives = np.arange(number_of_alternatives,
+                             dtype=dtype)[:, np.newaxis]
+
+    rankings = np.empty((num_voters, number_of_alternatives), dtype=dtype)
+    for start in range(0, num_voters, chunk_size):
+        chunk_codes = codes[start:start + chunk_size]
+        chunk_voters = len(chunk_codes)
+        # One row per alternative keeps every insertion step on contiguous
+        # memory
+        positions = np.zeros((number_of_alternatives, chunk_voters),
+                             dtype=dtype)
+        for i in range(number_of_alternatives):
+            slot = (i - chunk_codes[:, i]).astype(dtype)
+            positions[:i] += positions[:i] >= slot
+            positions[i] = slot
+        rankings[start + np.arange(chunk_voters), positions] = alternatives
+    return rankings
+
+
+def sample_mallows_rankings(num_voters, number_of_alternatives,
+                            dispersion_parameter, rng=None):
+    """
+    sample_mallows_rankings(num_voters, number_of_alternatives,
+                            dispersion_parameter, rng=None)
+
+    Draws rankings from the Mallows phi-model around the reference ranking
+    [0, 1, ..., number_of_alternatives - 1] with the repeated insertion
+    model. No permutation is enumerated: memory grows with num_voters *
+    number_of_alternatives and time with num_voters *
+    number_of_alternatives ** 2 (see insertion_codes_to_rankings).
+
+    Parameters
+    ----------
+    num_voters: int
+        number of rankings
+    number_of_alternatives: int
+        number of alternatives
+    dispersion_parameter: float
+        the probability of a ranking is proportional to
+        dispersion_parameter ** (Kendall tau distance to the reference)
+    rng: numpy.random.Generator or int, optional
+        random number generator or seed (see get_rng)
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    return insertion_codes_to_rankings(sample_mallows_insertion_codes(
+        num_voters, number_of_alternatives, dispersion_parameter, rng))
+
+
+@functools.lru_cache(maxsize=None)
+def mahonian_numbers(number_of_alternatives):
+    """
+    mahonian_numbers(number_of_alternatives)
+
+    Returns the number of rankings of number_of_alternatives alternatives
+    at every Kendall tau distance 0, 1, ..., n(n-1)/2 from a reference
+    ranking (the Mahonian numbers), as exact integers.
+
+    Example
+    -------
+    mahonian_numbers(3)  # returns (1, 2, 2, 1)
+    """
+    if number_of_alternatives <= 1:
+        return (1,)
+
+    previous = mahonian_numbers(number_of_alternatives - 1)
+    max_distance = len(previous) - 1 + number_of_alternatives - 1
+    # Inserting the last alternative adds 0, ..., n-1 inversions, so every
+    # number is a window sum over the previous row
+    prefix_sums = [0]
+    for count in previous:
+        prefix_sums.append(prefix_sums[-1] + count)
+    numbers = []
+    for d in range(max_distance + 1):
+        upper = min(d, len(previous) - 1) + 1
+        lower = max(0, d - number_of_alternatives + 1)
+        numbers.append(prefix_sums[upper] - prefix_sums[lower])
+    return tuple(numbers)
+
+
+def log_mahonian_table(number_of_alternatives):
+    """
+    log_mahonian_table(number_of_alternatives)
+
+    Returns an array of shape (n + 1, n(n-1)/2 + 1) whose row i holds the
+    logarithms of the Mahonian numbers of i alternatives (-inf where there
+    is no ranking at that distance).
+    """
+    max_distance = number_of_alternatives * (number_of_alternatives - 1) // 2
+    table = np.full((number_of_alternatives + 1, max_distance + 1), -np.inf)
+    for i in range(number_of_alternatives + 1):
+        numbers = mahonian_numbers(i)
+        table[i, :len(numbers)] = [math.log(count) for count in numbers]
+    return table
+
+
+def transformed_mallows_distance_distribution(number_of_alternatives,
+                                              dispersion_parameter,
+                                              transformation_parameter=0):
+    """
+    transformed_mallows_distance_distribution(number_of_alternatives,
+                                              dispersion_parameter,
+                                              transformation_parameter=0)
+
+    Returns the probability of every Kendall tau distance 0, ..., n(n-1)/2
+    under the transformed Mallows model, where a ranking at distance d has
+    likelihood dispersion_parameter ** (d ** exp(transformation_parameter)).
+    The weights are combined with the Mahonian numbers in log space, so no
+    ranking is enumerated.
+
+    Returns
+    -------
+    numpy array
+    """
+    distances = np.arange(
+        number_of_alternatives * (number_of_alternatives - 1) // 2 + 1)
+    log_counts = np.array([math.log(count) for count in
+                           mahonian_numbers(number_of_alternatives)])
+
+    if dispersion_parameter == 0:
+        # Only the reference ranking has a non-zero likelihood
+        probabilities = np.zeros(len(distances))
+        probabilities[0] = 1
+        return probabilities
+
+    log_likelihood = np.log(dispersion_parameter) \
+        * distances ** np.exp(transformation_parameter)
+    log_weights = log_counts + log_likelihood
+    weights = np.exp(log_weights - np.max(log_weights))
+    return weights / np.sum(weights)
+
+
+def sample_uniform_insertion_codes(distances, number_of_alternatives,
+                                   rng=None):
+    """
+    sample_uniform_insertion_codes(distances, number_of_alternatives,
+                                   rng=None)
+
+    Draws for every requested Kendall tau distance the insertion codes (see
+    sample_mallows_insertion_codes) of a ranking chosen uniformly among the
+    rankings at that distance from the reference ranking.
+
+    Returns
+    -------
+    numpy array of shape (len(distances), number_of_alternatives)
+    """
+    rng = get_rng(rng)
+    log_counts = log_mahonian_table(number_of_alternatives)
+    remaining = np.array(distances, dtype=np.int64)
+    codes = np.zeros((len(remaining), number_of_alternatives),
+                     dtype=np.int64)
+
+    # The code of alternative i is k with probability proportional to the
+    # number of ways the first i codes can sum to the remaining distance - k
+    for i in range(number_of_alternatives - 1, -1, -1):
+        rest = remaining[:, np.newaxis] - np.arange(i + 1)
+        valid = (rest >= 0) & (rest < log_counts.shape[1])
+        log_weights = np.where(
+            valid,
+            log_counts[i, np.clip(rest, 0, log_counts.shape[1] - 1)],
+            -np.inf)
+        weights = np.exp(log_weights
+                         - np.max(log_weights, axis=1, keepdims=True))
+        cumulated = np.cumsum(weights, axis=1)
+        draws = rng.random(len(remaining)) * cumulated[:, -1]
+        codes[:, i] = np.minimum(
+            np.count_nonzero(cumulated <= draws[:, np.newaxis], axis=1),
+            i)
+        remaining -= codes[:, i]
+    return codes
+
+
+def sample_transformed_mallows_rankings(num_voters, number_of_alternatives,
+                                        dispersion_parameter,
+                                        transformation_parameter=0,
+                                        rng=None):
+    """
+    sample_transformed_mallows_rankings(num_voters, number_of_alternatives,
+                                        dispersion_parameter,
+                                        transformation_parameter=0,
+                                        rng=None)
+
+    Draws rankings from the transformed Mallows model around the reference
+    ranking [0, 1, ..., number_of_alternatives - 1]: first a Kendall tau
+    distance per voter from transformed_mallows_distance_distribution, then
+    a ranking uniformly among the rankings at that distance.
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    probabilities = transformed_mallows_distance_distribution(
+        number_of_alternatives, dispersion_parameter,
+        transformation_parameter)
+    rng = get_rng(rng)
+    distances = rng.choice(len(probabilities), num_voters, p=probabilities)
+    return insertion_codes_to_rankings(sample_uniform_insertion_codes(
+        distances, number_of_alternatives, rng))
+
+
+def mallows_expected_distance(number_of_alternatives, dispersion_parameter):
+    """
+    mallows_expected_distance(number_of_alternatives, dispersion_parameter)
+
+    Returns the expected Kendall tau distance to the reference ranking under
+    the Mallows model. With theta = -log(dispersion_parameter), the
+    distance is a sum of independent insertion codes and
+    E[D] = sum over j = 1, ..., n - 1 of
+    1 / expm1(theta) - (j + 1) / expm1((j + 1) * theta),
+    the derivative of -log of get_mallows_normalization_constant.
+    """
+    if dispersion_parameter >= 1:
+        return number_of_alternatives * (number_of_alternatives - 1) / 4
+    if dispersion_parameter <= 0:
+        return 0.0
+    theta = -math.log(dispersion_parameter)
+    sizes = np.arange(2, number_of_alternatives + 1)
+    return float(np.sum(1 / np.expm1(theta)
+                        - sizes / np.expm1(sizes * theta)))
+
+
+def estimate_mallows(profile, reference_rank=None):
+    """
+    estimate_mallows(profile, reference_rank=None)
+
+    Fits a Mallows model to a profile. The reference ranking defaults to a
+    Kemeny ranking of the profile (see Profile.kemeny_ranking). The
+    maximum likelihood dispersion parameter only depends on the mean
+    Kendall tau distance d of the voters to the reference, which is read
+    from the pairwise majority matrix; it solves
+    mallows_expected_distance(n, dispersion_parameter) = d, by bisection
+    in theta = -log(dispersion_parameter).
+
+    Parameters
+    ----------
+    profile: Profile
+        the observed profile
+    reference_rank: list, optional
+        the reference ranking of the model
+
+    Returns
+    -------
+    reference_rank: list
+        the reference ranking
+    dispersion_parameter: float
+        1 if the voters are no closer to the reference than uniformly
+        drawn rankings, 0 if they all agree with it
+    """
+    if reference_rank is None:
+        reference_rank = profile.kemeny_ranking()
+    number_of_alternatives = profile.num_candidates
+    mean_distance = kemeny_cost(
+        profile.get_pairwise_matrix(),
+        profile.get_candidate_indices(reference_rank)) / profile.num_voters
+
+    if mean_distance >= number_of_alternatives \
+            * (number_of_alternatives - 1) / 4:
+        return reference_rank, 1.0
+    if mean_distance == 0:
+        return reference_rank, 0.0
+
+    # The expected distance decreases in theta
+    low, high = 0.0, 1.0
+    while mallows_expected_distance(number_of_alternatives,
+                                    math.exp(-high)) > mean_distance:
+        low, high = high, 2 * high
+    while high - low > 1e-12 * high:
+        theta = (low + high) / 2
+        if mallows_expected_distance(number_of_alternatives,
+                                     math.exp(-theta)) > mean_distance:
+            low = theta
+        else:
+            high = theta
+    return reference_rank, math.exp(-(low + high) / 2)
+
+
+def sample_uniform_rankings(num_voters, number_of_alternatives, rng=None):
+    """
+    sample_uniform_rankings(num_voters, number_of_alternatives, rng=None)
+
+    Draws rankings of range(number_of_alternatives) uniformly at random
+    (impartial culture).
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    noise = get_rng(rng).random((num_voters, number_of_alternatives))
+    return np.argsort(noise, axis=1).astype(
+        index_dtype(number_of_alternatives))
+
+
+def sample_urn_rankings(num_voters, number_of_alternatives, alpha,
+                        rng=None):
+    """
+    sample_urn_rankings(num_voters, number_of_alternatives, alpha, rng=None)
+
+    Draws rankings from the Polya-Eggenberger urn model with replacement
+    parameter alpha (see Profile.gen_urn_voters).
+
+    After t draws the urn holds the n! initial rankings and alpha * n!
+    copies of each drawn ranking, so voter t draws a fresh uniform ranking
+    with probability 1 / (1 + alpha * t) and otherwise copies a uniformly
+    chosen earlier voter. The copy chains are resolved by pointer jumping.
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    rng = get_rng(rng)
+    voters = np.arange(num_voters)
+    fresh = rng.random(num_voters) * (1 + alpha * voters) < 1
+    copied = np.floor(rng.random(num_voters) * voters).astype(np.int64)
+    source = np.where(fresh, voters, copied)
+    while True:
+        next_source = source[source]
+        if np.array_equal(next_source, source):
+            break
+        source = next_source
+
+    fresh_voters = np.flatnonzero(fresh)
+    fresh_rankings = sample_uniform_rankings(len(fresh_voters),
+                                             number_of_alternatives, rng)
+    return fresh_rankings[np.searchsorted(fresh_voters, source)]
+
+
+def sample_single_peaked_walsh_rankings(num_voters, number_of_alternatives,
+                                        rng=None):
+    """
+    sample_single_peaked_walsh_rankings(num_voters, number_of_alternatives,
+                                        rng=None)
+
+    Draws rankings uniformly among the rankings that are single-peaked on
+    the axis 0, 1, ..., number_of_alternatives - 1 (Walsh's sampler): the
+    ranking is built from the bottom, every time taking the leftmost or the
+    rightmost remaining alternative with equal probability.
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    rng = get_rng(rng)
+    dtype = index_dtype(number_of_alternatives)
+    rankings = np.empty((num_voters, number_of_alternatives), dtype=dtype)
+    left = np.zeros(num_voters, dtype=np.int64)
+    right = np.full(num_voters, number_of_alternatives - 1, dtype=np.int64)
+    take_left = rng.random((number_of_alternatives, num_voters)) < 0.5
+    for position in range(number_of_alternatives - 1, 0, -1):
+        rankings[:, position] = np.where(take_left[position], left, right)
+        left += take_left[position]
+        right -= ~take_left[position]
+    rankings[:, 0] = left
+    return rankings
+
+
+def sample_single_peaked_conitzer_rankings(num_voters,
+                                           number_of_alternatives, rng=None):
+    """
+    sample_single_peaked_conitzer_rankings(num_voters,
+                                           number_of_alternatives, rng=None)
+
+    Draws rankings that are single-peaked on the axis 0, 1, ...,
+    number_of_alternatives - 1 with Conitzer's model: the peak is uniform,
+    and every next alternative is the left or the right neighbour of the
+    ranked ones with equal probability, as long as both exist.
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    rng = get_rng(rng)
+    dtype = index_dtype(number_of_alternatives)
+    rankings = np.empty((num_voters, number_of_alternatives), dtype=dtype)
+    peak = np.floor(rng.random(num_voters)
+                    * number_of_alternatives).astype(np.int64)
+    rankings[:, 0] = peak
+    left = peak - 1
+    right = peak + 1
+    coin = rng.random((number_of_alternatives, num_voters)) < 0.5
+    for position in range(1, number_of_alternatives):
+        can_go_left = left >= 0
+        go_left = np.where(can_go_left & (right < number_of_alternatives),
+                           coin[position], can_go_left)
+        rankings[:, position] = np.where(go_left, left, right)
+        left -= go_left
+        right += ~go_left
+    return rankings
+
+
+def sample_euclidean_rankings(num_voters, number_of_alternatives,
+                              dimensions=1, rng=None, voter_positions=None,
+                              candidate_positions=None):
+    """
+    sample_euclidean_rankings(num_voters, number_of_alternatives,
+                              dimensions=1, rng=None, voter_positions=None,
+                              candidate_positions=None)
+
+    Draws rankings from a Euclidean spatial model: every voter ranks the
+    alternatives by their distance to the voter. Positions that are not
+    given are drawn uniformly from [0, 1] ** dimensions.
+
+    Returns
+    -------
+    numpy array of shape (num_voters, number_of_alternatives)
+    """
+    rng = get_rng(rng)
+    if voter_positions is None:
+        voter_positions = rng.random((num_voters, dimensions))
+    if candidate_positions is None:
+        candidate_positions = rng.random((number_of_alternatives,
+                                          dimensions))
+    voter_positions = np.asarray(voter_positions, dtype=float).reshape(
+        num_voters, -1)
+    candidate_positions = np.asarray(candidate_positions,
+                                     dtype=float).reshape(
+                                         number_of_alternatives, -1)
+
+    # |v - c|^2 = |v|^2 - 2 v.c + |c|^2; |v|^2 does not change the order
+    distances = (candidate_positions ** 2).sum(axis=1) \
+        - 2 * voter_positions @ candidate_positions.T
+    return np.argsort(distances, axis=1).astype(
+        index_dtype(number_of_alternatives))
@@ -0,0 +1,281 @@
+"""
+Reading and writing profiles.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .enumeration import index_dtype
+from .profile import AnonymousProfile, Profile
+
+
+def read_preflib_header(path):
+    """
+    read_preflib_header(path)
+
+    Reads the metadata of a PrefLib .soc or .soi file, in the current
+    format ("# KEY: value" lines) or the legacy format (number of
+    alternatives, one "number,name" line per alternative and a
+    "voters,sum,unique orders" line).
+
+    Returns
+    -------
+    dict
+        the metadata with lower case keys, e.g. "data type" and
+        "number voters"; "alternative names" maps every alternative number
+        to its name
+    """
+    header = {"alternative names": {}}
+    with open(path, encoding="utf-8") as preflib_file:
+        first_line = preflib_file.readline().strip()
+        if first_line.startswith("#"):
+            line = first_line
+            while line.startswith("#"):
+                key, _, value = line[1:].partition(":")
+                key = key.strip().lower()
+                value = value.strip()
+                if key.startswith("alternative name "):
+                    number = int(key[len("alternative name "):])
+                    header["alternative names"][number] = value
+                else:
+                    header[key] = value
+                line = preflib_file.readline().strip()
+        else:
+            num_alternatives = int(first_line)
+            header["number alternatives"] = str(num_alternatives)
+            for _ in range(num_alternatives):
+                number, _, name = preflib_file.readline().partition(",")
+                header["alternative names"][int(number)] = name.strip()
+            voters, _, unique_orders = \
+                preflib_file.readline().strip().rpartition(",")
+            header["number voters"] = voters.partition(",")[0]
+            header["number unique orders"] = unique_orders
+
+    if not header["alternative names"]:
+        header["alternative names"] = {
+            number: str(number)
+            for number in range(1, int(header["number alternatives"]) + 1)}
+    return header
+
+
+def iter_preflib_ballots(path, names=True):
+    """
+    iter_preflib_ballots(path, names=True)
+
+    Yields the ballots of a PrefLib .soc or .soi file one line at a time,
+    without reading the whole file.
+
+    Parameters
+    ----------
+    path: str
+        path of the file
+    names: bool
+        if True, the alternatives are given by name, otherwise by their
+        number in the file
+
+    Yields
+    ------
+    (int, tuple)
+        number of voters with the ballot, and the ballot from the most to
+        the least preferred alternative (incomplete for .soi files)
+    """
+    alternative_names = read_preflib_header(path)["alternative names"]
+    legacy_header_lines = None
+
+    with open(path, encoding="utf-8") as preflib_file:
+        for line in preflib_file:
+            line = line.strip()
+            if legacy_header_lines is None:
+                legacy_header_lines = 0 if line.startswith("#") \
+                    else len(alternative_names) + 2
+            if legacy_header_lines:
+                legacy_header_lines -= 1
+                continue
+            if not line or line.startswith("#"):
+                continue
+            if "{" in line:
+                raise ValueError("Ballots with ties are not supported")
+
+            if ":" in line:
+                count, _, ballot = line.partition(":")
+            else:
+                count, _, ballot = line.partition(",")
+            ballot = tuple(int(a) for a in ballot.split(",") if a.strip())
+            if names:
+                ballot = tuple(alternative_names[a] for a in ballot)
+            yield int(count), ballot
+
+
+def read_preflib(path, anonymous=False):
+    """
+    read_preflib(path, anonymous=False)
+
+    Reads a PrefLib .soc file (or a .soi file whose ballots are complete)
+    into a profile. The ballots are collected as distinct orders with
+    their counts and expanded straight into the integer voter array.
+
+    Parameters
+    ----------
+    path: str
+        path of the file
+    anonymous: bool
+        if True, returns an AnonymousProfile
+
+    Returns
+    -------
+    Profile or AnonymousProfile
+    """
+    alternative_names = read_preflib_header(path)["alternative names"]
+    profile = AnonymousProfile() if anonymous else Profile()
+    profile.set_candidates(list(alternative_names.values()))
+    index = {number: profile.candidates.index(name)
+             for number, name in alternative_names.items()}
+
+    counts = []
+    orders = []
+    for count, ballot in iter_preflib_ballots(path, names=False):
+        if len(ballot) != profile.num_candidates:
+            raise ValueError("Incomplete ballot: profiles need complete "
+                             "preferences, use iter_preflib_ballots")
+        counts.append(count)
+        orders.append([index[a] for a in ballot])
+
+    orders = np.array(orders, dtype=index_dtype(profile.num_candidates))
+    if anonymous:
+        profile.set_voter_array(orders, counts=counts)
+    else:
+        profile.set_voter_array(np.repeat(orders, counts, axis=0))
+    return profile
+
+
+def write_preflib(profile, path, title=""):
+    """
+    write_preflib(profile, path, title="")
+
+    Writes a profile as a PrefLib file with one line per distinct
+    preference. The data type is "soi" if path ends with ".soi" and "soc"
+    otherwise; the alternatives are numbered in the order of
+    profile.candidates. PrefLib stores the names of the alternatives as
+    text, so read_preflib returns them as strings (a candidate 1 is read
+    back as "1").
+    """
+    anonymous_profile = profile if isinstance(profile, AnonymousProfile) \
+        else profile.to_anonymous()
+    order = np.argsort(-anonymous_profile.counts, kind="stable")
+    file_name = os.path.basename(path)
+    data_type = "soi" if file_name.endswith(".soi") else "soc"
+
+    with open(path, "w", encoding="utf-8") as preflib_file:
+        preflib_file.write("# FILE NAME: " + file_name + "\n")
+        preflib_file.write("# TITLE: " + title + "\n")
+        preflib_file.write("# DATA TYPE: " + data_type + "\n")
+        preflib_file.write("# NUMBER ALTERNATIVES: "
+                           + str(profile.num_candidates) + "\n")
+        preflib_file.write("# NUMBER VOTERS: "
+                           + str(anonymous_profile.num_voters) + "\n")
+        preflib_file.write("# NUMBER UNIQUE ORDERS: "
+                           + str(anonymous_profile.num_rankings) + "\n")
+        for number, name in enumerate(profile.candidates, 1):
+            preflib_file.write("# ALTERNATIVE NAME " + str(number) + ": "
+                               + str(name) + "\n")
+
+        voter_array = anonymous_profile.get_voter_array()
+        for row in order.tolist():
+            preflib_file.write(
+                str(anonymous_profile.counts[row]) + ": "
+                + ",".join(str(c + 1) for c in voter_array[row].tolist())
+                + "\n")
+
+
+PROFILE_FILE_MAGIC = b"CHOICEPY"
+PROFILE_FILE_VERSION = 1
+PROFILE_FILE_ALIGNMENT = 64
+
+
+def save_profile(profile, path):
+    """
+    save_profile(profile, path)
+
+    Saves a profile in the binary choicepy format: a short JSON header with
+    the candidates, followed by the raw integer voter array (and, for an
+    AnonymousProfile, the counts), aligned so that load_profile can memory
+    map it.
+
+    The candidates are stored as JSON, so they must be strings or numbers;
+    numpy numbers are loaded back as the equal Python numbers.
+    """
+    if profile.get_voter_array() is None:
+        raise ValueError("Cannot save a profile without voters")
+    voter_array = np.ascontiguousarray(
+        profile.get_voter_array(), dtype=index_dtype(profile.num_candidates))
+    weights = profile.get_voter_weights()
+    candidates = [c.item() if isinstance(c, np.generic) else c
+                  for c in profile.candidates]
+    if not all(isinstance(c, (str, int, float)) for c in candidates):
+        raise ValueError("Only profiles whose candidates are strings or "
+                         "numbers can be saved")
+    header = json.dumps({
+        "version": PROFILE_FILE_VERSION,
+        "candidates": candidates,
+        "num_rows": int(voter_array.shape[0]),
+        "num_candidates": int(profile.num_candidates),
+        "dtype": voter_array.dtype.str,
+        "weighted": weights is not None}).encode("utf-8")
+
+    prefix_length = len(PROFILE_FILE_MAGIC) + 8
+    padding = -(prefix_length + len(header)) % PROFILE_FILE_ALIGNMENT
+    header += b" " * padding
+
+    with open(path, "wb") as profile_file:
+        profile_file.write(PROFILE_FILE_MAGIC)
+        profile_file.write(len(header).to_bytes(8, "little"))
+        profile_file.write(header)
+        voter_array.tofile(profile_file)
+        if weights is not None:
+            np.asarray(weights, dtype="<i8").tofile(profile_file)
+
+
+def load_profile(path, mmap=True):
+    """
+    load_profile(path, mmap=True)
+
+    Loads a profile saved by save_profile. With mmap=True the voter array
+    of a Profile is a read-only memory map of the file, so the profile
+    opens without reading the voters, and rules that only need the voter
+    array (e.g. plurality and Borda) tally it without copying it.
+
+    Returns
+    -------
+    Profile or AnonymousProfile
+    """
+    with open(path, "rb") as profile_file:
+        if profile_file.read(len(PROFILE_FILE_MAGIC)) != PROFILE_FILE_MAGIC:
+            raise ValueError("Not a choicepy profile file: " + str(path))
+        header_length = int.from_bytes(profile_file.read(8), "little")
+        header = json.loads(profile_file.read(header_length).decode("utf-8"))
+        offset = profile_file.tell()
+
+    shape = (header["num_rows"], header["num_candidates"])
+    dtype = np.dtype(header["dtype"])
+    if mmap:
+        voter_array = np.memmap(path, dtype=dtype, mode="r", offset=offset,
+                                shape=shape)
+    else:
+        voter_array = np.fromfile(path, dtype=dtype, offset=offset,
+                                  count=shape[0] * shape[1]).reshape(shape)
+
+    # The stored indices refer to the candidates in the stored order
+    profile = AnonymousProfile() if header["weighted"] else Profile()
+    profile.candidates = header["candidates"]
+    profile.num_candidates = len(profile.candidates)
+
+    if header["weighted"]:
+        counts = np.fromfile(path, dtype="<i8",
+                             offset=offset + voter_array.nbytes,
+                             count=shape[0])
+        profile.set_voter_array(voter_array, counts=counts)
+    else:
+        profile.set_voter_array(voter_array)
+    return profile
@@ -0,0 +1,1345 @@
+"""
+The profile classes.
+"""
+
+import itertools
+import math
+import random
+
+import numpy as np
+
+from .utils import convert_condensed, get_lexicographic_list, terminal_size
+from .enumeration import (
+    ballot_codes, count_arrangements, decode_ballots, filter_unique,
+    index_dtype, permutation_array)
+from .generation import (
+    get_rng, sample_euclidean_rankings, sample_mallows_rankings,
+    sample_single_peaked_conitzer_rankings,
+    sample_single_peaked_walsh_rankings, sample_transformed_mallows_rankings,
+    sample_uniform_rankings, sample_urn_rankings)
+from .rules import (
+    ELECTION_RULES, condorcet_mask, copeland_scores, kemeny_consensus,
+    pairwise_majority_matrix, position_histogram, schwartz_set_mask,
+    scoring_matrix, scoring_vector, select_candidates, select_winners,
+    smith_set_mask)
+
+
+class Profile:
+    """
+    A class used to represent a voting profile.
+
+    Attributes
+    ----------
+    voters: list of lists
+        the voters' preferences;
+        every element in the outer list is a strict and complete
+        preference list over the candidates
+    num_voters: int
+        number of voters
+    candidates: list
+        list of candidates
+    num_candidates: int
+        number of candidates
+
+    The voters can also be held as a (num_voters, num_candidates) array of
+    candidate indices (see set_voter_array and get_voter_array). The voting
+    rules work on this array and translate back to candidate names only
+    for their result.
+
+    Quantities derived from the voters (position array, pairwise matrix,
+    first place counts and score vectors) are computed once and shared by
+    all rules until the voters or the candidates change.
+
+    Methods
+    -------
+    TODO:
+    get_column_width()
+    iter_profile_string(num_voters_per_block=None)
+    profile_string_full()
+    print_full(num_voters_per_block=None)
+    set_voters(voter_list)
+    set_voter_array(voter_array, candidates=None)
+    copy_candidates(profile)
+    get_candidate_indices(candidate_names)
+    get_reference_indices(candidate_list)
+    get_voter_array()
+    get_position_array()
+    get_pairwise_matrix()
+    get_first_place_counts()
+    get_position_histogram()
+    get_scores(points_list)
+    get_score_table(rules)
+    get_voter_weights()
+    get_full_voter_array()
+    get_key()
+    get_sorted_voter_array()
+    to_anonymous()
+    compact()
+    set_candidates(candidates)
+    gen_uniform_voters(candidate_list, num_voters, rng=None)
+    gen_mallows_voters(candidate_list,
+                       num_voters,
+                       dispersion_parameter,
+                       transformation_parameter=0,
+                       rng=None)
+    gen_mistaken_truth_voters(candidate_list, num_voters, stdev, rng=None)
+    gen_impartial_anonymous_voters(candidate_list, num_voters, rng=None)
+    gen_urn_voters(candidate_list, num_voters, alpha, rng=None)
+    gen_single_peaked_voters(candidate_list, num_voters, method="walsh",
+                             rng=None)
+    gen_euclidean_voters(candidate_list, num_voters, dimensions=1, rng=None,
+                         voter_positions=None, candidate_positions=None)
+    create_voter_permutations(with_myself=False)
+    rename_candidates(dictionary)
+    get_candidate_permutation_array()
+    iter_candidate_permutations(with_myself=False)
+    create_candidate_permutations(with_myself=False)
+    create_vc_permutations(with_myself=False)
+    canonical_form()
+    orbit_size()
+    get_voter(voter_index)
+    get_voters(concentrate=False)
+    get_ballot_histogram()
+    summarize_voters()
+    print_summary()
+    dictator(dictator_index=None)
+    plurality()
+    majority()
+    approval(acceptable_rank=None)
+    condorcet()
+    copeland(alpha=0.5)
+    smith_set()
+    schwartz_set()
+    get_kemeny_consensus()
+    kemeny_ranking()
+    kemeny()
+    gen_borda_rule(point_distribution)
+    borda(points_list=None)
+    elect(rule)
+    elect_many(rules)
+    """
+
+    def __init__(self, voters: list = None):
+        """
+        Parameters
+        ----------
+        voters: list of lists
+            the voters' preferences;
+            every element in the outer list is a strict and complete
+            preference list over the candidates
+        num_voters: int
+            number of voters
+        candidates: list
+            list of candidates
+        num_candidates: int
+            number of candidates
+        """
+        self._voters = None
+        self._voter_array = None
+        self._position_array = None
+        self._pairwise_matrix = None
+        self._statistics = {}
+        self.voters = voters
+        if voters:
+            self.num_voters = len(voters)
+            self.candidates = sorted(voters[0])
+            self.num_candidates = len(self.candidates)
+        else:
+            self.num_voters = 0
+            self.candidates = None
+            self.num_candidates = 0
+
+    @property
+    def voters(self):
+        # Array backed profiles translate names only when they are asked for
+        if self._voters is None and self._voter_array is not None:
+            candidate_names = np.array(self.candidates, dtype=object)
+            self._voters = candidate_names[self._voter_array].tolist()
+        return self._voters
+
+    @voters.setter
+    def voters(self, voter_list):
+        self.reset_cache()
+        self._voters = voter_list
+
+    def __getitem__(self, voter_no):
+        return self.get_voter(voter_no)
+
+    def __iter__(self):
+        self.n = 0
+        return self
+
+    def __next__(self):
+        if self.n < self.num_voters:
+            next_voter = self.get_voter(self.n)
+            self.n += 1
+            return next_voter
+        else:
+            raise StopIteration
+
+    def __eq__(self, other):
+        # equality check
+        if isinstance(other, list):
+            return self.voters == other
+
+        if isinstance(other, Profile):
+            return self.get_key() == other.get_key()
+
+    def __hash__(self):
+        return hash(self.get_key())
+
+    def get_key(self):
+        """
+        Returns an immutable, hashable key of the profile: equal profiles
+        have equal keys. Profiles can therefore be put in sets and used as
+        dict keys; do not change the voters of a profile while it is in one.
+        The key does not depend on the order of self.candidates.
+        """
+        voter_array = self.get_sorted_voter_array()
+        if voter_array is None:
+            return (None,)
+        return (tuple(sorted(self.candidates)), voter_array.shape,
+                voter_array.tobytes())
+
+    def get_sorted_voter_array(self):
+        """
+        Returns the voter array with indices into the sorted list of
+        candidates, which differs from get_voter_array() when
+        self.candidates is not sorted (e.g. generated labels beyond "z").
+        """
+        voter_array = self.get_voter_array()
+        if voter_array is None:
+            return None
+        dtype = index_dtype(self.num_candidates)
+        order = sorted(range(self.num_candidates),
+                       key=self.candidates.__getitem__)
+        if order == list(range(self.num_candidates)):
+            return voter_array.astype(dtype, copy=False)
+        sorted_indices = np.empty(self.num_candidates, dtype=dtype)
+        sorted_indices[order] = np.arange(self.num_candidates, dtype=dtype)
+        return sorted_indices[voter_array]
+
+    def __str__(self):
+        if self.num_voters and self.get_voter_array() is not None:
+            term_columns = terminal_size().columns
+
+            voters_printable = [str(self.num_candidates) + " candidates, "
+                                + str(self.num_voters) + " voters \n",
+                                "Profile: " + self.print_summary() + "\n",
+                                "\n"]
+            if self.num_voters * self.get_column_width() <= term_columns:
+                voters_printable.append(self.profile_string_full())
+            else:
+                voters_printable.append(
+                    """omitting full print due to terminal size.
+                use .print_full() to print the full profile""")
+
+            return "".join(voters_printable)
+        else:
+            return "Empty profile"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_column_width(self):
+        """
+        Returns the width of a voter's column in the printed profile.
+        """
+        max_length = max(len(str(c)) for c in self.candidates)
+        return max(max_length, len(str(self.num_voters - 1))) + 3
+
+    def iter_profile_string(self, num_voters_per_block=None):
+        """
+        Yields the table of profile_string_full() one line at a time: a
+        header with the voter numbers, then one line per rank position
+        with the candidate every voter ranks there.
+
+        Parameters
+        ----------
+        num_voters_per_block: int, optional
+            if given, the table is split into blocks of this many voters,
+            separated by an empty line
+        """
+        justify_length = self.get_column_width()
+        voter_array = self.get_full_voter_array()
+        padded_names = np.array([str(c).ljust(justify_length)
+                                 for c in self.candidates], dtype=object)
+
+        block_size = num_voters_per_block or max(1, self.num_voters)
+        for start in range(0, self.num_voters, block_size):
+            stop = min(start + block_size, self.num_voters)
+            if start:
+                yield "\n"
+            yield "".join([("[" + str(item) + "]").ljust(justify_length)
+                           for item in range(start, stop)]) + "\n"
+            for i in range(self.num_candidates):
+                yield "".join(
+                    padded_names[voter_array[start:stop, i]].tolist()) + "\n"
+
+    def profile_string_full(self):
+        return "".join(self.iter_profile_string())
+
+    def print_full(self, num_voters_per_block=None):
+        for line in self.iter_profile_string(num_voters_per_block):
+            print(line, end="")
+
+    def set_voters(self, voter_list):
+        self.voters = voter_list
+        self.num_voters = len(self.voters)
+        self.set_candidates(sorted(self.voters[0]))
+
+    def set_voter_array(self, voter_array, candidates=None):
+        """
+        Sets the voters from an integer array without building the list of
+        lists of candidate names.
+
+        Parameters
+        ----------
+        voter_array: array-like of shape (num_voters, num_candidates)
+            every row is a preference given as indices into the sorted
+            list of candidates
+        candidates: list or int, optional
+            the candidates; if omitted, the current candidates are kept
+        """
+        if candidates is not None:
+            self.set_candidates(candidates)
+        if self.candidates is None:
+            raise ValueError("Candidates must be set before the voters")
+
+        voter_array = np.asarray(voter_array)
+        self.reset_cache()
+        self._voters = None
+        self._voter_array = voter_array.astype(
+            index_dtype(self.num_candidates), copy=False)
+        self.num_voters = voter_array.shape[0]
+
+    def copy_candidates(self, profile):
+        """
+        Takes over the candidates of another profile in their order, so that
+        the voter arrays of both profiles index the same candidates.
+        set_candidates would sort them, which reorders generated labels
+        beyond "z" ("aa" sorts before "b").
+        """
+        self.candidates = list(profile.candidates)
+        self.num_candidates = profile.num_candidates
+
+    def get_candidate_indices(self, candidate_names):
+        """
+        Returns the indices of the given candidates in self.candidates as
+        an array.
+        """
+        candidate_index = {c: i for i, c in enumerate(self.candidates)}
+        return np.array([candidate_index[c] for c in candidate_names],
+                        dtype=index_dtype(self.num_candidates))
+
+    def get_reference_indices(self, candidate_list):
+        """
+        Returns the indices of the candidates in the order of candidate_list,
+        or of self.candidates if candidate_list is a number, as used by the
+        generators for their reference ranking or axis.
+        """
+        if isinstance(candidate_list, list):
+            return self.get_candidate_indices(candidate_list)
+        return self.get_candidate_indices(self.candidates)
+
+    def get_voter_array(self):
+        """
+        Returns the voters as an array of shape (num_voters, num_candidates)
+        where every row lists the indices of the candidates (in
+        self.candidates) from the most to the least preferred.
+        """
+        if self._voter_array is None and self._voters:
+            # Candidates given by number are not in sorted order
+            candidate_array = np.array(self.candidates)
+            candidate_order = np.argsort(candidate_array, kind="stable")
+            self._voter_array = candidate_order[np.searchsorted(
+                candidate_array, np.array(self._voters),
+                sorter=candidate_order)].astype(
+                    index_dtype(self.num_candidates))
+        return self._voter_array
+
+    def get_position_array(self):
+        """
+        Returns the inverse of get_voter_array(): an array of shape
+        (num_voters, num_candidates) where entry [v, c] is the rank position
+        (0 is the top) of candidate c in the preference of voter v.
+        """
+        if self._position_array is None:
+            voter_array = self.get_voter_array()
+            if voter_array is None:
+                return None
+            positions = np.empty_like(voter_array)
+            positions[np.arange(voter_array.shape[0])[:, np.newaxis],
+                      voter_array] = np.arange(self.num_candidates)
+            self._position_array = positions
+        return self._position_array
+
+    def compact(self):
+        """
+        Keeps only the integer array representation of the voters and drops
+        the list of lists of candidate names. The names are rebuilt on
+        demand when the voters attribute is accessed.
+        """
+        if self.get_voter_array() is not None:
+            self._voters = None
+
+    def get_pairwise_matrix(self):
+        """
+        Returns the pairwise majority matrix: entry [a, b] is the number of
+        voters who prefer self.candidates[a] to self.candidates[b].
+        """
+        if self._pairwise_matrix is None:
+            self._pairwise_matrix = pairwise_majority_matrix(
+                self.get_position_array(),
+                weights=self.get_voter_weights())
+        return self._pairwise_matrix
+
+    def get_first_place_counts(self):
+        """
+        Returns the number of voters who rank every candidate first.
+        """
+        if "first_place_counts" not in self._statistics:
+            self._statistics["first_place_counts"] = np.bincount(
+                self.get_voter_array()[:, 0],
+                weights=self.get_voter_weights(),
+                minlength=self.num_candidates)
+        return self._statistics["first_place_counts"]
+
+    def get_position_histogram(self):
+        """
+        Returns the array of shape (num_candidates, num_candidates) whose
+        entry [c, k] is the number of voters who rank self.candidates[c] at
+        position k (0 is the top); see position_histogram.
+        """
+        if "position_histogram" not in self._statistics:
+            self._statistics["position_histogram"] = position_histogram(
+                self.get_voter_array(), weights=self.get_voter_weights())
+        return self._statistics["position_histogram"]
+
+    def get_scores(self, points_list):
+        """
+        Returns the score of every candidate under the positional scoring
+        rule that gives points_list[k] points for rank position k.
+        """
+        key = ("scores", tuple(points_list))
+        if key not in self._statistics:
+            self._statistics[key] = \
+                self.get_position_histogram() @ np.asarray(points_list)
+        return self._statistics[key]
+
+    def get_score_table(self, rules):
+        """
+        Returns the scores of the candidates under several positional
+        scoring rules at once.
+
+        Parameters
+        ----------
+        rules: list or numpy array
+            rule names or scoring vectors (see scoring_vector), or a
+            matrix with one scoring vector per row (e.g.
+            approval_scoring_matrix(num_candidates))
+
+        Returns
+        -------
+        numpy array of shape (num_rules, num_candidates)
+            entry [r, c] is the score of self.candidates[c] under rule r
+        """
+        return scoring_matrix(rules, self.num_candidates) \
+            @ self.get_position_histogram().T
+
+    def get_voter_weights(self):
+        """
+        Returns the number of voters holding every row of get_voter_array(),
+        or None if every row is a single voter.
+        """
+        return None
+
+    def get_full_voter_array(self):
+        """
+        Returns the voter array with one row per voter (see
+        get_voter_array).
+        """
+        return self.get_voter_array()
+
+    def to_anonymous(self):
+        """
+        Returns the profile as an AnonymousProfile.
+        """
+        return AnonymousProfile.from_profile(self)
+
+    def reset_cache(self):
+        self._voter_array = None
+        self._position_array = None
+        self._pairwise_matrix = None
+        self._statistics = {}
+
+    def set_candidates(self, candidates):
+        if isinstance(candidates, list):
+            self.candidates = sorted(candidates)
+        elif isinstance(candidates, float) or isinstance(candidates, int):
+            self.candidates = get_lexicographic_list(candidates)
+        self.num_candidates = len(self.candidates)
+        if self._voters is not None:
+            # The cached arrays index into the previous candidate list
+            self.reset_cache()
+
+    def gen_uniform_voters(self, candidate_list, num_voters, rng=None):
+        """
+        Draws every voter's preference uniformly among all preferences,
+        for all voters at once.
+
+        Parameters
+        ----------
+        candidate_list: list or int
+            the candidates, or their number
+        num_voters: int
+            number of voters
+        rng: numpy.random.Generator or int, optional
+            random number generator or seed (see get_rng); the global numpy
+            random state by default
+        """
+        self.num_voters = num_voters
+        self.set_candidates(candidate_list)
+        self.set_voter_array(sample_uniform_rankings(num_voters,
+                                                     self.num_candidates,
+                                                     rng))
+
+    def gen_mallows_voters(self,
+                           candidate_list,
+                           num_voters,
+                           dispersion_parameter,
+                           transformation_parameter=0,
+                           rng=None):
+
+        self.num_voters = num_voters
+        self.set_candidates(candidate_list)
+
+        if transformation_parameter == 0:
+            rankings = sample_mallows_rankings(num_voters,
+                                               self.num_candidates,
+                                               dispersion_parameter,
+                                               rng)
+        else:
+            rankings = sample_transformed_mallows_rankings(
+                num_voters, self.num_candidates, dispersion_parameter,
+                transformation_parameter, rng)
+        self.set_voter_array(
+            self.get_reference_indices(candidate_list)[rankings])
+
+    def gen_mistaken_truth_voters(self, candidate_list, num_voters, stdev,
+                                  rng=None):
+        """
+        Every voter perceives the rank positions 0, 1, ..., n-1 with normal
+        noise of standard deviation stdev; the candidate at position i of
+        candidate_list is replaced by the candidate whose index is the rank
+        of the perceived value i. All voters are drawn at once.
+
+        Parameters
+        ----------
+        candidate_list: list or int
+            the candidates in their true order, or their number
+        num_voters: int
+            number of voters
+        stdev: float
+            standard deviation of the noise
+        rng: numpy.random.Generator or int, optional
+            random number generator or seed (see get_rng); the global numpy
+            random state by default
+        """
+        self.num_voters = num_voters
+        self.set_candidates(candidate_list)
+
+        norms = np.arange(self.num_candidates) \
+            + get_rng(rng).normal(0, stdev, (num_voters, self.num_candidates))
+
+        # norm_ranks[v, i] is the rank of norms[v, i] within its row
+        order = np.argsort(norms, axis=1)
+        norm_ranks = np.empty_like(order)
+        norm_ranks[np.arange(num_voters)[:, np.newaxis], order] = \
+            np.arange(self.num_candidates)
+        self.set_voter_array(
+            self.get_reference_indices(candidate_list)[norm_ranks])
+
+    def gen_impartial_anonymous_voters(self, candidate_list, num_voters,
+                                       rng=None):
+        """
+        Draws the voters from the impartial anonymous culture: every
+        anonymous profile (multiset of preferences) is equally likely.
+
+        Parameters
+        ----------
+        candidate_list: list or int
+            the candidates, or their number
+        num_voters: int
+            number of voters
+        rng: numpy.random.Generator or int, optional
+            random number generator or seed (see get_rng)
+        """
+        self.gen_urn_voters(candidate_list, num_voters,
+                            1 / math.factorial(len(candidate_list)
+                                               if isinstance(candidate_list,
+                                                             list)
+                                               else candidate_list),
+                            rng)
+
+    def gen_urn_voters(self, candidate_list, num_voters, alpha, rng=None):
+        """
+        Draws the voters from the Polya-Eggenberger urn model: the urn
+        starts with one copy of every preference, and every drawn
+        preference is put back together with alpha * num_candidates!
+        copies. alpha = 0 is the impartial culture, alpha = 1 /
+        num_candidates! the impartial anonymous culture.
+
+        Parameters
+        ----------
+        candidate_list: list or int
+            the candidates, or their number
+        num_voters: int
+            number of voters
+        alpha: float
+            replacement parameter
+        rng: numpy.random.Generator or int, optional
+            random number generator or seed (see get_rng)
+        """
+        self.num_voters = num_voters
+        self.set_candidates(candidate_list)
+        self.set_voter_array(sample_urn_rankings(num_voters,
+                                                 self.num_candidates,
+                                                 alpha, rng))
+
+    def gen_single_peaked_voters(self, candidate_list, num_voters,
+                                 method="walsh", rng=None):
+        """
+        Draws preferences that are single-peaked on the axis given by the
+        order of candidate_list.
+
+        Parameters
+        ----------
+        candidate_list: list or int
+            the candidates in the order of the axis, or their number
+        num_voters: int
+            number of voters
+        method: str
+            "walsh": uniform over all single-peaked preferences
+            "conitzer": uniform peak, then every next candidate is the left
+                        or right neighbour with equal probability
+        rng: numpy.random.Generator or int, optional
+            random number generator or seed (see get_rng)
+        """
+        self.num_voters = num_voters
+        self.set_candidates(candidate_list)
+        if method == "walsh":
+            rankings = sample_single_peaked_walsh_rankings(
+                num_voters, self.num_candidates, rng)
+        elif method == "conitzer":
+            rankings = sample_single_peaked_conitzer_rankings(
+                num_voters, self.num_candidates, rng)
+        else:
+            raise ValueError("""method: please choose "walsh" or
+                             "conitzer" """)
+        self.set_voter_array(
+            self.get_reference_indices(candidate_list)[rankings])
+
+    def gen_euclidean_voters(self, candidate_list, num_voters, dimensions=1,
+                             rng=None, voter_positions=None,
+                             candidate_positions=None):
+        """
+        Draws the voters from a Euclidean spatial model: voters and
+        candidates are points in [0, 1] ** dimensions (uniformly drawn
+        unless given), and every voter ranks the candidates by distance.
+
+        Parameters
+        ----------
+        candidate_list: list or int
+            the candidates, or their number
+        num_voters: int
+            number of voters
+        dimensions: int
+            dimension of the space
+        rng: numpy.random.Generator or int, optional
+            random number generator or seed (see get_rng)
+        voter_positions: array-like of shape (num_voters, dimensions),
+                         optional
+        candidate_positions: array-like of shape (num_candidates,
+                             dimensions), optional
+            positions in the order of candidate_list
+        """
+        self.num_voters = num_voters
+        self.set_candidates(candidate_list)
+        rankings = sample_euclidean_rankings(num_voters, self.num_candidates,
+                                             dimensions, rng,
+                                             voter_positions,
+                                             candidate_positions)
+        self.set_voter_array(
+            self.get_reference_indices(candidate_list)[rankings])
+
+    def create_voter_permutations(self, with_myself=False):
+        permutation_list = []
+        voter_permutations = list(itertools.permutations(self.voters))
+        unique_voter_permutations = filter_unique(voter_permutations)
+        for p in unique_voter_permutations:
+            if not list(p) == self.voters or with_myself:
+                permutation_list.append(Profile(list(p)))
+        return permutation_list
+
+    def rename_candidates(self, dictionary):
+        renamed = np.array([dictionary[c] for c in self.candidates],
+                           dtype=object)
+        return renamed[self.get_full_voter_array()].tolist()
+
+    def get_candidate_permutation_array(self):
+        """
+        Returns the voter arrays of the profile under every relabelling of
+        the candidates, stacked into an array of shape
+        (num_candidates!, num_voters, num_candidates). Relabelling s maps
+        candidate i to candidate permutation_array()[s][i], in the order
+        of create_all_mappings.
+        """
+        permutations = permutation_array(self.num_candidates).astype(
+            index_dtype(self.num_candidates))
+        return permutations[:, self.get_full_voter_array()]
+
+    def iter_candidate_permutations(self, with_myself=False):
+        """
+        Yields the distinct profiles obtained by relabelling the candidates,
+        one at a time, in the order of create_candidate_permutations.
+        """
+        permutations = permutation_array(self.num_candidates).astype(
+            index_dtype(self.num_candidates))
+        voter_array = self.get_full_voter_array()
+        seen = set()
+        if not with_myself:
+            seen.add(voter_array.tobytes())
+
+        for permutation in permutations:
+            relabelled = permutation[voter_array]
+            key = relabelled.tobytes()
+            if key not in seen:
+                seen.add(key)
+                profile = Profile()
+                profile.copy_candidates(self)
+                profile.set_voter_array(relabelled)
+                yield profile
+
+    def create_candidate_permutations(self, with_myself=False):
+        return list(self.iter_candidate_permutations(with_myself))
+
+    def create_vc_permutations(self, with_myself=False):
+        # Combination of both. First gets voters perms then candidate
+        permutation_list = []
+        final_list = []
+        voter_permutations = list(itertools.permutations(self.voters))
+        unique_voter_permutations = filter_unique(voter_permutations)
+
+        for p in unique_voter_permutations:
+            permutation_list.append(Profile(list(p)))
+
+        for profile in permutation_list:
+            final_list.extend(profile.create_candidate_permutations())
+
+        return permutation_list + final_list
+
+    def get_relabelled_ballot_codes(self):
+        """
+        Returns an array of shape (num_candidates!, num_voters) whose row s
+        holds the sorted ballot codes (see ballot_codes) of the profile
+        after relabelling the candidates by permutation_array()[s].
+        """
+        permutations = permutation_array(self.num_candidates)
+        relabelled = permutations[:, self.get_full_voter_array()]
+        return np.sort(ballot_codes(relabelled, self.num_candidates), axis=1)
+
+    def canonical_form(self):
+        """
+        Returns the representative of the profiles that are equal to this
+        one up to reordering the voters and relabelling the candidates:
+        among all relabellings, the one whose sorted preferences are
+        lexicographically smallest, with the voters sorted.
+        """
+        relabelled = self.get_relabelled_ballot_codes()
+        smallest = relabelled[np.lexsort(relabelled.T[::-1])[0]]
+        profile = Profile()
+        profile.copy_candidates(self)
+        profile.set_voter_array(decode_ballots(smallest, self.num_candidates))
+        return profile
+
+    def orbit_size(self):
+        """
+        Returns the number of profiles that are equal to this one up to
+        reordering the voters and relabelling the candidates.
+        """
+        relabelled = self.get_relabelled_ballot_codes()
+        stabilizer_size = np.count_nonzero(
+            np.all(relabelled == relabelled[0], axis=1))
+        multiplicities = np.unique(relabelled[0], return_counts=True)[1]
+        return len(relabelled) // stabilizer_size \
+            * count_arrangements(multiplicities.tolist())
+
+    def get_voter(self, voter_index):
+        if self._voters is None and self._voter_array is not None:
+            return [self.candidates[c]
+                    for c in self._voter_array[voter_index].tolist()]
+        return self.voters[voter_index]
+
+    def get_voters(self, concentrate=False):
+        if concentrate:
+            return convert_condensed(self.voters)
+        else:
+            return self.voters
+
+    def get_ballot_histogram(self):
+        """
+        Returns the distinct preferences of the voters as rows of candidate
+        indices (see get_voter_array), in lexicographic order, and the
+        number of voters holding each of them.
+        """
+        if "ballot_histogram" not in self._statistics:
+            rankings, inverse = np.unique(self.get_voter_array(), axis=0,
+                                          return_inverse=True)
+            counts = np.bincount(np.ravel(inverse),
+                                 weights=self.get_voter_weights(),
+                                 minlength=len(rankings)).astype(np.int64)
+            self._statistics["ballot_histogram"] = (rankings, counts)
+        return self._statistics["ballot_histogram"]
+
+    def summarize_voters(self):
+        rankings, counts = self.get_ballot_histogram()
+        candidate_names = np.array([str(c) for c in self.candidates],
+                                   dtype=object)
+        return {"".join(ranking): count for ranking, count
+                in zip(candidate_names[rankings].tolist(), counts.tolist())}
+
+    def print_summary(self):
+        summary = self.summarize_voters()
+        sortedkeys = sorted(summary, key=str.lower)
+        sortedlist = [k + ":" + str(summary[k]) + " | " for k in sortedkeys]
+        return "".join(sortedlist)
+
+    def dictator(self, dictator_index=None):
+        # print(self.num_voters)
+        if dictator_index is not None:
+            if dictator_index <= self.num_voters:
+                return self.get_voter(dictator_index)[0]
+            else:
+                print("Invalid dictator index")
+                return None
+        else:
+            return list(self.get_voter(random.randrange(self.num_voters))[0])
+
+    def plurality(self):
+        if not self.num_voters:
+            return []
+        return select_winners(self.get_first_place_counts(), self.candidates)
+
+    def majority(self):
+        if not self.num_voters:
+            return []
+        top_votes = self.get_first_place_counts()
+        return [self.candidates[c] for c in
+                np.flatnonzero(top_votes >= 0.5 * self.num_voters)]
+
+    def approval(self, acceptable_rank=None):
+
+        if acceptable_rank is None:
+            acceptable_rank = np.random.randint(1, self.num_candidates,
+                                                size=self.num_voters)
+        else:
+            acceptable_rank = np.full(self.num_voters, acceptable_rank)
+
+        approved = self.get_position_array() < acceptable_rank[:, np.newaxis]
+        approvals = np.count_nonzero(approved, axis=0)
+
+        return select_winners(approvals, self.candidates)
+
+    def condorcet(self):
+        return select_candidates(condorcet_mask(self.get_pairwise_matrix()),
+                                 self.candidates)
+
+    def copeland(self, alpha=0.5):
+        """
+        Elects the candidates with the most pairwise majority wins; a
+        pairwise tie counts as alpha of a win.
+        """
+        return select_winners(copeland_scores(self.get_pairwise_matrix(),
+                                              alpha),
+                              self.candidates)
+
+    def smith_set(self):
+        return select_candidates(smith_set_mask(self.get_pairwise_matrix()),
+                                 self.candidates)
+
+    def schwartz_set(self):
+        return select_candidates(
+            schwartz_set_mask(self.get_pairwise_matrix()),
+            self.candidates)
+
+    def get_kemeny_consensus(self):
+        """
+        Returns the result of kemeny_consensus for the profile: a Kemeny
+        ranking as candidate indices and the mask of the candidates on top
+        of a Kemeny ranking.
+        """
+        if "kemeny" not in self._statistics:
+            self._statistics["kemeny"] = kemeny_consensus(
+                self.get_pairwise_matrix())
+        return self._statistics["kemeny"]
+
+    def kemeny_ranking(self):
+        """
+        Returns a ranking of the candidates with the smallest sum of
+        Kendall tau distances to the voters (exact up to 20 candidates, see
+        kemeny_consensus).
+        """
+        ranking, _ = self.get_kemeny_consensus()
+        return [self.candidates[c] for c in ranking.tolist()]
+
+    def kemeny(self):
+        """
+        Elects the candidates ranked first in a Kemeny ranking.
+        """
+        _, winners = self.get_kemeny_consensus()
+        return select_candidates(winners, self.candidates)
+
+    def gen_borda_rule(self, point_distribution):
+        """
+        This function gets a string and returns the corresponding list of
+        points used in the Borda-count rule.
+        :param point_distribution: string, valid inputs:
+          "borda_0",
+          "borda_1",
+          "dowdall",
+          "plurality",
+          "veto",
+          "approval_k" (e.g. "approval_2")
+        :return: a list
+            -"borda_0": returns [n-1,n-2,...,0]
+            -"borda_1": returns [n,n-1,...,1]
+            -"dowdall": returns [1, 1/2, 1/3, ..., 1/n]
+            -"plurality": returns [1, 0, ..., 0]
+            -"veto": returns [1, ..., 1, 0]
+            -"approval_k": returns k ones followed by zeros
+            (n = len(self.candidates))
+        """
+        return scoring_vector(point_distribution,
+                              len(self.candidates)).tolist()
+
+    def borda(self, points_list=None):
+        """
+        Elects a winner according to the weighted rankings of the voters.
+        :param points_list: a list (for example the output of
+        gen_borda_rule(self, point_distribution))
+        :return: a string (the name of the winner of the election)
+        """
+        if points_list is None:
+            points_list = self.gen_borda_rule("borda_0")
+        return select_winners(self.get_scores(points_list), self.candidates)
+
+    def elect(self, rule):
+        if rule in ELECTION_RULES:
+            return getattr(self, ELECTION_RULES[rule])()
+
+    def elect_many(self, rules=tuple(ELECTION_RULES)):
+        """
+        Elects the winners of several rules. The quantities the rules share
+        (e.g. the pairwise matrix for condorcet, copeland, smith and
+        schwartz) are computed once.
+
+        Parameters
+        ----------
+        rules: iterable of str
+            rule names accepted by elect
+
+        Returns
+        -------
+        dict
+            the winners of every rule
+        """
+        for rule in rules:
+            if rule not in ELECTION_RULES:
+                raise ValueError("Unknown rule: " + str(rule))
+        return {rule: self.elect(rule) for rule in rules}
+
+
+class AnonymousProfile(Profile):
+    """
+    A class used to represent an anonymous voting profile: every distinct
+    preference is stored once, together with the number of voters who hold
+    it. The voting rules of Profile work on the distinct preferences, so
+    their cost grows with the number of distinct preferences rather than
+    the number of voters.
+
+    Attributes
+    ----------
+    voters: list of lists
+        the voters' preferences, expanded on access; voters with the same
+        preference are listed next to each other
+    counts: numpy array
+        number of voters holding every row of get_voter_array()
+    num_voters: int
+        number of voters
+    num_rankings: int
+        number of distinct preferences
+    candidates: list
+        list of candidates
+    num_candidates: int
+        number of candidates
+
+    Methods
+    -------
+    from_profile(profile)
+    to_profile()
+    set_voter_array(voter_array, candidates=None, counts=None)
+    and the methods of Profile
+    """
+
+    def __init__(self, voters: list = None):
+        self.counts = None
+        self.num_rankings = 0
+        super().__init__()
+        if voters:
+            self.set_voters(voters)
+
+    @classmethod
+    def from_profile(cls, profile):
+        """
+        Returns the AnonymousProfile of a Profile.
+        """
+        anonymous_profile = cls()
+        if profile.num_voters:
+            anonymous_profile.copy_candidates(profile)
+            anonymous_profile.set_voter_array(
+                profile.get_voter_array(),
+                counts=profile.get_voter_weights())
+        return anonymous_profile
+
+    def to_profile(self):
+        """
+        Returns the profile with one row per voter as a Profile.
+        """
+        profile = Profile()
+        if self.num_voters:
+            profile.copy_candidates(self)
+            profile.set_voter_array(self.get_full_voter_array())
+        return profile
+
+    @property
+    def voters(self):
+        if self._voter_array is None:
+            return None
+        return self.to_profile().voters
+
+    @voters.setter
+    def voters(self, voter_list):
+        if voter_list:
+            self.set_voters(voter_list)
+        else:
+            self.reset_cache()
+            self.counts = None
+
+    def set_voters(self, voter_list):
+        profile = Profile(voter_list)
+        self.set_voter_array(profile.get_voter_array(), profile.candidates)
+
+    def set_voter_array(self, voter_array, candidates=None, counts=None):
+        """
+        Sets the voters from an integer array (see Profile.set_voter_array).
+        Equal rows are merged.
+
+        Parameters
+        ----------
+        voter_array: array-like of shape (num_rows, num_candidates)
+            preferences as indices into the sorted list of candidates
+        candidates: list or int, optional
+            the candidates; if omitted, the current candidates are kept
+        counts: array-like of shape (num_rows,), optional
+            number of voters holding every row; one voter each by default
+        """
+        voter_array = np.asarray(voter_array)
+        if counts is None:
+            counts = np.ones(len(voter_array), dtype=np.int64)
+
+        rankings, inverse = np.unique(voter_array, axis=0,
+                                      return_inverse=True)
+        super().set_voter_array(rankings, candidates)
+        self.counts = np.bincount(np.ravel(inverse), weights=counts,
+                                  minlength=len(rankings)).astype(np.int64)
+        self.num_rankings = len(rankings)
+        self.num_voters = int(np.sum(self.counts))
+
+    def get_voter_weights(self):
+        return self.counts
+
+    def get_full_voter_array(self):
+        return np.repeat(self.get_voter_array(), self.counts, axis=0)
+
+    def get_voter(self, voter_index):
+        if voter_index < 0:
+            voter_index += self.num_voters
+        if not 0 <= voter_index < self.num_voters:
+            raise IndexError("voter index out of range")
+        row = np.searchsorted(np.cumsum(self.counts), voter_index,
+                              side="right")
+        return [self.candidates[c] for c in self._voter_array[row].tolist()]
+
+    def compact(self):
+        pass
+
+    def __eq__(self, other):
+        if isinstance(other, AnonymousProfile):
+            return self.get_key() == other.get_key()
+        if isinstance(other, Profile):
+            # A plain profile keeps the order of its voters and an anonymous
+            # one does not, so they are never equal (their keys differ too)
+            return False
+        return self.to_profile() == other
+
+    def __hash__(self):
+        return hash(self.get_key())
+
+    def get_key(self):
+        if self.counts is None:
+            return (None,)
+        # The rows are sorted by their indices, which depend on the order
+        # of the candidates, so they are sorted again after translating
+        voter_array = self.get_sorted_voter_array()
+        rows = np.lexsort(voter_array.T[::-1])
+        return (tuple(sorted(self.candidates)), voter_array.shape,
+                voter_array[rows].tobytes(),
+                self.get_voter_weights()[rows].astype(np.int64).tobytes())
+
+    def get_ballot_histogram(self):
+        return self.get_voter_array(), self.counts
+
+    def approval(self, acceptable_rank=None):
+        positions = self.get_position_array()
+
+        if acceptable_rank is not None:
+            approvals = self.counts @ (positions < acceptable_rank)
+            return select_winners(approvals, self.candidates)
+
+        # Every voter approves the candidates above a uniformly drawn rank
+        # in 1, ..., num_candidates - 1; draw how many voters of every
+        # preference pick each rank
+        num_ranks = self.num_candidates - 1
+        rank_counts = np.array([np.random.multinomial(count,
+                                                      [1 / num_ranks]
+                                                      * num_ranks)
+                                for count in self.counts.tolist()])
+        # Voters of a preference approve its k-th candidate if they drew
+        # an acceptable rank above k
+        approving = np.cumsum(rank_counts[:, ::-1], axis=1)[:, ::-1]
+        approving = np.hstack([approving,
+                               np.zeros((self.num_rankings, 1),
+                                        dtype=approving.dtype)])
+        approvals = np.take_along_axis(approving, positions.astype(np.intp),
+                                       axis=1).sum(axis=0)
+        return select_winners(approvals, self.candidates)
+
+
+class IncrementalProfile(AnonymousProfile):
+    """
+    A class used to represent an anonymous voting profile whose ballots
+    arrive and are withdrawn one at a time. The profile keeps the position
+    counts (how many voters rank every candidate at every position) and the
+    pairwise majority matrix up to date, so adding or removing a ballot
+    costs O(num_candidates^2) and plurality, majority, Borda, Condorcet and
+    Copeland winners are read from the tallies without going through the
+    voters.
+
+    Attributes
+    ----------
+    voters: list of lists
+        the voters' preferences, expanded on access
+    ballot_counts: dict
+        number of voters holding every distinct preference, keyed by the
+        tuple of candidate indices
+    counts: numpy array
+        number of voters holding every row of get_voter_array()
+    num_voters: int
+        number of voters
+    num_rankings: int
+        number of distinct preferences
+    candidates: list
+        list of candidates
+    num_candidates: int
+        number of candidates
+
+    The arrays returned by get_position_histogram and get_pairwise_matrix are
+    the live tallies: they change when ballots are added or removed.
+
+    Methods
+    -------
+    add_voter(preference, count=1)
+    remove_voter(preference, count=1)
+    get_position_histogram()
+    refresh()
+    and the methods of AnonymousProfile
+    """
+
+    def __init__(self, voters: list = None, candidates=None):
+        """
+        Parameters
+        ----------
+        voters: list of lists, optional
+            the initial voters' preferences
+        candidates: list or int, optional
+            the candidates, or their number, if there are no initial voters
+        """
+        self.ballot_counts = {}
+        self._position_counts = np.zeros((0, 0), dtype=np.int64)
+        self._pairwise_counts = np.zeros((0, 0), dtype=np.int64)
+        self._arrays_outdated = False
+        super().__init__(voters)
+        if not voters and candidates is not None:
+            self.set_candidates(candidates)
+
+    @property
+    def voters(self):
+        self.refresh()
+        return super().voters
+
+    @voters.setter
+    def voters(self, voter_list):
+        if voter_list:
+            self.set_voters(voter_list)
+        else:
+            self.reset_cache()
+            self.counts = None
+            self.num_rankings = 0
+            self.num_voters = 0
+            self.ballot_counts = {}
+            self._position_counts[:] = 0
+            self._pairwise_counts[:] = 0
+            self._arrays_outdated = False
+
+    def set_candidates(self, candidates):
+        """
+        Sets the candidates and removes all ballots.
+        """
+        super().set_candidates(candidates)
+        self.reset_cache()
+        self.counts = None
+        self.num_rankings = 0
+        self.num_voters = 0
+        self.ballot_counts = {}
+        self._position_counts = np.zeros(
+            (self.num_candidates, self.num_candidates), dtype=np.int64)
+        self._pairwise_counts = np.zeros(
+            (self.num_candidates, self.num_candidates), dtype=np.int64)
+        self._arrays_outdated = False
+
+    def set_voter_array(self, voter_array, candidates=None, counts=None):
+        super().set_voter_array(voter_array, candidates, counts)
+        self.ballot_counts = dict(zip(map(tuple, self._voter_array.tolist()),
+                                      self.counts.tolist()))
+        positions = self.get_position_array()
+        self._position_counts = np.zeros(
+            (self.num_candidates, self.num_candidates), dtype=np.int64)
+        np.add.at(self._position_counts,
+                  (self._voter_array.astype(np.intp),
+                   np.arange(self.num_candidates)),
+                  self.counts[:, np.newaxis])
+        self._pairwise_counts = pairwise_majority_matrix(
+            positions, weights=self.counts).astype(np.int64)
+        self._arrays_outdated = False
+
+    def add_voter(self, preference, count=1):
+        """
+        Adds count voters with the given preference in
+        O(num_candidates^2).
+
+        Parameters
+        ----------
+        preference: list
+            a strict and complete preference list over the candidates
+        count: int
+            number of voters to add
+        """
+        self.update_tallies(preference, count)
+
+    def remove_voter(self, preference, count=1):
+        """
+        Removes count voters with the given preference in
+        O(num_candidates^2).
+
+        Parameters
+        ----------
+        preference: list
+            a preference held by at least count voters
+        count: int
+            number of voters to remove
+        """
+        self.update_tallies(preference, -count)
+
+    def update_tallies(self, preference, count):
+        if self.candidates is None:
+            raise ValueError("Candidates must be set before the voters")
+        ranking = self.get_candidate_indices(preference)
+        if len(ranking) != self.num_candidates or \
+                len(set(ranking.tolist())) != self.num_candidates:
+            raise ValueError("Invalid preference: " + str(preference))
+
+        key = tuple(ranking.tolist())
+        new_count = self.ballot_counts.get(key, 0) + count
+        if new_count < 0:
+            raise ValueError("Not enough voters with preference "
+                             + str(preference))
+        if new_count:
+            self.ballot_counts[key] = new_count
+        else:
+            del self.ballot_counts[key]
+
+        positions = np.empty(self.num_candidates, dtype=np.intp)
+        positions[ranking] = np.arange(self.num_candidates)
+        self._position_counts[ranking, np.arange(self.num_candidates)] += \
+            count
+        self._pairwise_counts += count * (positions[:, np.newaxis]
+                                          < positions[np.newaxis, :])
+        self.num_voters += count
+        self.reset_cache()
+        self._arrays_outdated = True
+
+    def refresh(self):
+        """
+        Rebuilds the array representation of the voters (get_voter_array
+        and counts) from the ballots if ballots were added or removed
+        since it was last built.
+        """
+        if not self._arrays_outdated:
+            return
+        self._arrays_outdated = False
+        Profile.reset_cache(self)
+        rankings = sorted(self.ballot_counts)
+        if rankings:
+            self._voter_array = np.array(
+                rankings, dtype=index_dtype(self.num_candidates))
+            self.counts = np.array([self.ballot_counts[r] for r in rankings],
+                                   dtype=np.int64)
+        else:
+            self.counts = None
+        self.num_rankings = len(rankings)
+
+    def get_voter_array(self):
+        self.refresh()
+        return super().get_voter_array()
+
+    def get_voter_weights(self):
+        self.refresh()
+        return self.counts
+
+    def get_voter(self, voter_index):
+        self.refresh()
+        return super().get_voter(voter_index)
+
+    def get_key(self):
+        self.refresh()
+        return super().get_key()
+
+    def get_position_histogram(self):
+        return self._position_counts
+
+    def get_pairwise_matrix(self):
+        return self._pairwise_counts
+
+    def get_first_place_counts(self):
+        return self._position_counts[:, 0]
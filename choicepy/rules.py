@@ -0,0 +1,511 @@
+"""
+Voting rules on integer-encoded profiles.
+"""
+
+import numpy as np
+
+
+def select_winners(scores, candidates):
+    """
+    select_winners(scores, candidates)
+
+    Returns the candidates with the highest score, in candidate order.
+
+    Parameters
+    ----------
+    scores: numpy array
+        one score per candidate
+    candidates: list
+        list of candidates, aligned with scores
+
+    Returns
+    -------
+    list
+    """
+    return [candidates[i] for i in np.flatnonzero(scores == np.max(scores))]
+
+
+def select_candidates(mask, candidates):
+    """
+    select_candidates(mask, candidates)
+
+    Returns the candidates whose entry in a boolean mask is True.
+    """
+    return [candidates[i] for i in np.flatnonzero(mask)]
+
+
+def scoring_vector(rule, num_candidates):
+    """
+    scoring_vector(rule, num_candidates)
+
+    Returns the points of every rank position under a positional scoring
+    rule.
+
+    Parameters
+    ----------
+    rule: str or sequence
+        "plurality": [1, 0, ..., 0]
+        "veto": [1, ..., 1, 0]
+        "approval_k" (e.g. "approval_2"): 1 for the top k positions
+        "borda_0": [n-1, n-2, ..., 0]
+        "borda_1": [n, n-1, ..., 1]
+        "dowdall": [1, 1/2, 1/3, ..., 1/n]
+        or the points themselves, one per position
+    num_candidates: int
+        number of candidates n
+
+    Returns
+    -------
+    numpy array of shape (num_candidates,)
+    """
+    positions = np.arange(num_candidates)
+    if not isinstance(rule, str):
+        points = np.asarray(rule)
+        if points.shape != (num_candidates,):
+            raise ValueError("A scoring vector needs one entry per position")
+        return points
+    if rule == "plurality":
+        return (positions < 1).astype(np.int64)
+    if rule == "veto":
+        return (positions < num_candidates - 1).astype(np.int64)
+    if rule.startswith("approval_"):
+        return (positions < int(rule[len("approval_"):])).astype(np.int64)
+    if rule == "borda_0":
+        return num_candidates - 1 - positions
+    if rule == "borda_1":
+        return num_candidates - positions
+    if rule == "dowdall":
+        return 1 / (positions + 1)
+    raise ValueError("Unknown scoring rule: " + str(rule))
+
+
+def scoring_matrix(rules, num_candidates):
+    """
+    scoring_matrix(rules, num_candidates)
+
+    Stacks the scoring vectors of several rules (see scoring_vector) into
+    an array of shape (len(rules), num_candidates).
+    """
+    return np.vstack([scoring_vector(rule, num_candidates)
+                      for rule in rules])
+
+
+def approval_scoring_matrix(num_candidates):
+    """
+    approval_scoring_matrix(num_candidates)
+
+    Returns the scoring vectors of k-approval for k = 1, ...,
+    num_candidates - 1 (from plurality to veto) as the rows of an array.
+    """
+    return np.tri(num_candidates - 1, num_candidates, dtype=np.int64)
+
+
+def position_histogram(voter_array, weights=None, chunk_size=None):
+    """
+    position_histogram(voter_array, weights=None, chunk_size=None)
+
+    Returns the position histogram of a profile: entry [c, k] is the number
+    of voters who rank candidate c at position k (0 is the top). The scores
+    of any positional scoring rule follow as histogram @ points, and those
+    of many rules at once as histogram @ scoring_matrix(...).T.
+
+    Parameters
+    ----------
+    voter_array: numpy array of shape (num_voters, num_candidates)
+        indices of the candidates from the most to the least preferred
+        (see Profile.get_voter_array)
+    weights: numpy array of shape (num_voters,), optional
+        number of voters holding every row of voter_array
+    chunk_size: int, optional
+        number of voters counted at once; by default chosen so that the
+        temporary index array stays around 4 million entries
+
+    Returns
+    -------
+    numpy array of shape (num_candidates, num_candidates)
+    """
+    num_voters, num_candidates = np.shape(voter_array)
+    if chunk_size is None:
+        chunk_size = max(1, 2 ** 22 // max(1, num_candidates))
+
+    # Candidate c at position k is counted in bin c * num_candidates + k
+    histogram = np.zeros(num_candidates * num_candidates, dtype=np.int64)
+    for start in range(0, num_voters, chunk_size):
+        chunk = voter_array[start:start + chunk_size]
+        bins = np.ravel(chunk.astype(np.intp) * num_candidates
+                        + np.arange(num_candidates))
+        chunk_weights = None if weights is None else \
+            np.repeat(weights[start:start + chunk_size], num_candidates)
+        histogram += np.bincount(bins, weights=chunk_weights,
+                                 minlength=histogram.size).astype(np.int64)
+    return histogram.reshape(num_candidates, num_candidates)
+
+
+def pairwise_majority_matrix(position_array, chunk_size=None, weights=None):
+    """
+    pairwise_majority_matrix(position_array, chunk_size=None, weights=None)
+
+    Returns the pairwise majority matrix of a profile: entry [a, b] is the
+    number of voters who rank candidate a above candidate b.
+
+    Parameters
+    ----------
+    position_array: numpy array of shape (num_voters, num_candidates)
+        rank position of every candidate for every voter
+        (see Profile.get_position_array)
+    chunk_size: int, optional
+        number of voters compared at once; by default chosen so that the
+        temporary comparison array stays around 4 million entries
+    weights: numpy array of shape (num_voters,), optional
+        number of voters holding every row of position_array
+
+    Returns
+    -------
+    numpy array of shape (num_candidates, num_candidates)
+    """
+    num_voters, num_candidates = np.shape(position_array)
+    if chunk_size is None:
+        chunk_size = max(1, 2 ** 22 // max(1, num_candidates ** 2))
+
+    matrix = np.zeros((num_candidates, num_candidates), dtype=np.int64)
+    for start in range(0, num_voters, chunk_size):
+        chunk = position_array[start:start + chunk_size]
+        comparisons = chunk[:, :, np.newaxis] < chunk[:, np.newaxis, :]
+        if weights is None:
+            matrix += np.count_nonzero(comparisons, axis=0)
+        else:
+            matrix += np.tensordot(weights[start:start + chunk_size],
+                                   comparisons, axes=1).astype(np.int64)
+    return matrix
+
+
+def transitive_closure(relation):
+    """
+    transitive_closure(relation)
+
+    Returns the transitive closure of a relation given as a square boolean
+    matrix, or a stack of them (Warshall's algorithm, one vectorized step
+    per element).
+    """
+    closure = np.array(relation, dtype=bool)
+    for k in range(closure.shape[-1]):
+        closure |= closure[..., :, [k]] & closure[..., [k], :]
+    return closure
+
+
+def condorcet_mask(pairwise_matrix):
+    """
+    condorcet_mask(pairwise_matrix)
+
+    Returns a boolean mask of the candidates that beat every other candidate
+    in a pairwise majority comparison. A stack of pairwise matrices gives a
+    stack of masks.
+    """
+    beats = pairwise_matrix > np.swapaxes(pairwise_matrix, -1, -2)
+    beats |= np.eye(beats.shape[-1], dtype=bool)
+    return np.all(beats, axis=-1)
+
+
+def copeland_scores(pairwise_matrix, alpha=0.5):
+    """
+    copeland_scores(pairwise_matrix, alpha=0.5)
+
+    Returns the Copeland score of every candidate: the number of pairwise
+    majority wins plus alpha times the number of pairwise ties.
+    """
+    transposed = np.swapaxes(pairwise_matrix, -1, -2)
+    wins = pairwise_matrix > transposed
+    ties = pairwise_matrix == transposed
+    ties &= ~np.eye(ties.shape[-1], dtype=bool)
+    return np.count_nonzero(wins, axis=-1) \
+        + alpha * np.count_nonzero(ties, axis=-1)
+
+
+def smith_set_mask(pairwise_matrix):
+    """
+    smith_set_mask(pairwise_matrix)
+
+    Returns a boolean mask of the Smith set: the smallest non-empty set of
+    candidates that beat every candidate outside the set.
+    """
+    weak_closure = transitive_closure(
+        pairwise_matrix >= np.swapaxes(pairwise_matrix, -1, -2))
+    return np.all(weak_closure, axis=-1)
+
+
+def schwartz_set_mask(pairwise_matrix):
+    """
+    schwartz_set_mask(pairwise_matrix)
+
+    Returns a boolean mask of the Schwartz set: the union of the minimal
+    sets of candidates that are not beaten by any candidate outside.
+    """
+    strict_closure = transitive_closure(
+        pairwise_matrix > np.swapaxes(pairwise_matrix, -1, -2))
+    return np.all(~np.swapaxes(strict_closure, -1, -2) | strict_closure,
+                  axis=-1)
+
+
+def kemeny_cost(pairwise_matrix, ranking):
+    """
+    kemeny_cost(pairwise_matrix, ranking)
+
+    Returns the Kemeny score of a ranking: the number of (voter, pair of
+    candidates) disagreements with the profile, i.e. the sum of the Kendall
+    tau distances between the ranking and the voters.
+
+    Parameters
+    ----------
+    pairwise_matrix: numpy array of shape (num_candidates, num_candidates)
+        pairwise majority matrix (see Profile.get_pairwise_matrix)
+    ranking: sequence of int
+        candidate indices from the most to the least preferred
+    """
+    positions = np.empty(len(ranking), dtype=np.intp)
+    positions[np.asarray(ranking)] = np.arange(len(ranking))
+    return int(np.sum(np.asarray(pairwise_matrix).T[
+        positions[:, np.newaxis] < positions[np.newaxis, :]]))
+
+
+def kemeny_local_search(pairwise_matrix, ranking):
+    """
+    kemeny_local_search(pairwise_matrix, ranking)
+
+    Improves a ranking by moving single candidates to the position that
+    lowers its Kemeny score the most, until no move lowers it. Every pass
+    over the candidates costs O(num_candidates^2).
+
+    Returns
+    -------
+    numpy array
+        candidate indices from the most to the least preferred
+    """
+    pairwise_matrix = np.asarray(pairwise_matrix, dtype=np.int64)
+    # Moving x past y changes the score by margins[x, y]
+    margins = pairwise_matrix - pairwise_matrix.T
+    ranking = np.array(ranking, dtype=np.intp)
+    num_candidates = len(ranking)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(num_candidates):
+            x = ranking[i]
+            row = margins[x, ranking]
+            changes = np.zeros(num_candidates, dtype=np.int64)
+            changes[i + 1:] = np.cumsum(row[i + 1:])
+            changes[:i] = np.cumsum(-row[:i][::-1])[::-1]
+            j = int(np.argmin(changes))
+            if changes[j] < 0:
+                ranking = np.insert(np.delete(ranking, i), j, x)
+                improved = True
+    return ranking
+
+
+def kemeny_consensus(pairwise_matrix, max_exact_candidates=20):
+    """
+    kemeny_consensus(pairwise_matrix, max_exact_candidates=20)
+
+    Finds a Kemeny ranking of a profile: a ranking with the smallest sum of
+    Kendall tau distances to the voters.
+
+    Up to max_exact_candidates candidates the result is exact: a dynamic
+    program over the sets S of candidates placed on top computes the best
+    score f(S) of ordering them, one set size at a time, and drops every
+    set whose lower bound f(S) + (pairs split by S) + (best case inside the
+    rest) exceeds the score of the heuristic ranking. A backward pass then
+    marks the sets on optimal rankings, which gives all candidates that top
+    some Kemeny ranking. Above max_exact_candidates, the Borda ranking
+    improved by kemeny_local_search is returned.
+
+    Parameters
+    ----------
+    pairwise_matrix: numpy array of shape (num_candidates, num_candidates)
+        pairwise majority matrix (see Profile.get_pairwise_matrix)
+    max_exact_candidates: int
+        largest number of candidates solved exactly
+
+    Returns
+    -------
+    ranking: numpy array
+        a Kemeny ranking as candidate indices (the first one in candidate
+        index order when there are ties)
+    winners: numpy array of bool
+        True for the candidates on top of a Kemeny ranking (only the top
+        of the heuristic ranking above max_exact_candidates)
+    """
+    pairwise_matrix = np.array(pairwise_matrix, dtype=np.int64)
+    np.fill_diagonal(pairwise_matrix, 0)
+    num_candidates = len(pairwise_matrix)
+
+    borda_ranking = np.argsort(-pairwise_matrix.sum(axis=1), kind="stable")
+    ranking = kemeny_local_search(pairwise_matrix, borda_ranking)
+    if num_candidates > max_exact_candidates or num_candidates < 2:
+        winners = np.zeros(num_candidates, dtype=bool)
+        winners[ranking[:1]] = True
+        return ranking, winners
+
+    upper_bound = kemeny_cost(pairwise_matrix, ranking)
+    best_inside = np.minimum(pairwise_matrix, pairwise_matrix.T)
+    bit_values = np.left_shift(1, np.arange(num_candidates, dtype=np.int64))
+    unreachable = np.iinfo(np.int64).max // 4
+
+    # costs[S] is the best score of the sets S with a given bit pattern
+    costs = np.full(1 << num_candidates, unreachable, dtype=np.int64)
+    costs[0] = 0
+    layer = np.zeros(1, dtype=np.int64)
+    for _ in range(num_candidates):
+        extended = layer[:, np.newaxis] | bit_values
+        layer = np.unique(extended[extended != layer[:, np.newaxis]])
+        members = (layer[:, np.newaxis] & bit_values) != 0
+        # Placing c after the other members disagrees with the voters
+        # who prefer c to them
+        append_costs = members.astype(np.int64) @ pairwise_matrix.T
+        previous = costs[layer[:, np.newaxis] ^ bit_values]
+        layer_costs = np.where(members, previous + append_costs,
+                               unreachable).min(axis=1)
+
+        outside = (~members).astype(np.int64)
+        split = np.sum((outside @ pairwise_matrix) * members, axis=1)
+        inside = np.sum((outside @ best_inside) * outside, axis=1) // 2
+        keep = layer_costs + split + inside <= upper_bound
+        layer = layer[keep]
+        costs[layer] = layer_costs[keep]
+
+    # Walk back from the full set through the sets on optimal rankings
+    optimal = np.zeros(1 << num_candidates, dtype=bool)
+    optimal[layer] = True
+    for _ in range(num_candidates - 1):
+        members = (layer[:, np.newaxis] & bit_values) != 0
+        append_costs = members.astype(np.int64) @ pairwise_matrix.T
+        previous = layer[:, np.newaxis] ^ bit_values
+        tight = members & (costs[previous] + append_costs
+                           == costs[layer][:, np.newaxis])
+        layer = np.unique(previous[tight])
+        optimal[layer] = True
+    winners = optimal[bit_values]
+
+    ranking = []
+    placed = 0
+    for _ in range(num_candidates):
+        for c in range(num_candidates):
+            extended = placed | (1 << c)
+            if extended != placed and optimal[extended] and \
+                    costs[placed] + pairwise_matrix[c, ranking].sum() \
+                    == costs[extended]:
+                ranking.append(c)
+                placed = extended
+                break
+    return np.array(ranking, dtype=np.intp), winners
+
+
+BATCH_RULES = ("plurality", "majority", "approval", "borda", "condorcet",
+               "copeland", "smith", "schwartz")
+
+# Profile method behind every rule name accepted by Profile.elect
+ELECTION_RULES = {"dictator": "dictator",
+                  "plurality": "plurality",
+                  "majority": "majority",
+                  "approval": "approval",
+                  "condorcet": "condorcet",
+                  "borda": "borda",
+                  "copeland": "copeland",
+                  "smith": "smith_set",
+                  "schwartz": "schwartz_set",
+                  "kemeny": "kemeny"}
+
+
+def elect_batch(profile_array, rules=BATCH_RULES, acceptable_rank=None,
+                points_list=None):
+    """
+    elect_batch(profile_array, rules=BATCH_RULES, acceptable_rank=None,
+                points_list=None)
+
+    Elects the winners of many profiles with the same candidates and number
+    of voters at once, without building a Profile for each of them.
+
+    Parameters
+    ----------
+    profile_array: array-like of shape (num_profiles, num_voters,
+                                        num_candidates)
+        every profile as an integer voter array (see
+        Profile.get_voter_array)
+    rules: iterable of str
+        any of "plurality", "majority", "approval", "borda", "condorcet",
+        "copeland", "smith" and "schwartz"
+    acceptable_rank: int, optional
+        number of candidates every voter approves for the approval rule;
+        drawn uniformly in 1, ..., num_candidates - 1 for every voter by
+        default (as in Profile.approval)
+    points_list: list, optional
+        scores of the rank positions for the Borda rule; [n-1, ..., 1, 0]
+        by default
+
+    Returns
+    -------
+    dict
+        for every rule a boolean array of shape (num_profiles,
+        num_candidates) marking the winners of every profile
+
+    Example
+    -------
+    winners = elect_batch(profile_array, ["plurality", "condorcet"])
+    winners["condorcet"].any(axis=1)  # profiles with a Condorcet winner
+    """
+    profile_array = np.asarray(profile_array)
+    num_profiles, num_voters, num_candidates = np.shape(profile_array)
+    for rule in rules:
+        if rule not in BATCH_RULES:
+            raise ValueError("Unknown rule for elect_batch: " + str(rule))
+
+    def maximal(scores):
+        return scores == np.max(scores, axis=-1, keepdims=True)
+
+    winners = {}
+
+    if {"plurality", "majority"} & set(rules):
+        profile_offsets = np.arange(num_profiles)[:, np.newaxis] \
+            * num_candidates
+        top_votes = np.bincount(
+            np.ravel(profile_offsets + profile_array[:, :, 0]),
+            minlength=num_profiles * num_candidates).reshape(num_profiles,
+                                                             num_candidates)
+        if "plurality" in rules:
+            winners["plurality"] = maximal(top_votes)
+        if "majority" in rules:
+            winners["majority"] = top_votes >= 0.5 * num_voters
+
+    if set(rules) - {"plurality", "majority"}:
+        positions = np.empty_like(profile_array)
+        np.put_along_axis(positions, profile_array.astype(np.intp),
+                          np.arange(num_candidates,
+                                    dtype=profile_array.dtype),
+                          axis=2)
+
+    if "approval" in rules:
+        if acceptable_rank is None:
+            acceptable_rank = np.random.randint(
+                1, num_candidates, size=(num_profiles, num_voters, 1))
+        approvals = np.count_nonzero(positions < acceptable_rank, axis=1)
+        winners["approval"] = maximal(approvals)
+
+    if "borda" in rules:
+        if points_list is None:
+            points_list = np.arange(num_candidates - 1, -1, -1)
+        scores = np.asarray(points_list)[positions].sum(axis=1)
+        winners["borda"] = maximal(scores)
+
+    if {"condorcet", "copeland", "smith", "schwartz"} & set(rules):
+        pairwise = np.stack([np.count_nonzero(positions[:, :, [a]]
+                                              < positions, axis=1)
+                             for a in range(num_candidates)], axis=1)
+        if "condorcet" in rules:
+            winners["condorcet"] = condorcet_mask(pairwise)
+        if "copeland" in rules:
+            winners["copeland"] = maximal(copeland_scores(pairwise))
+        if "smith" in rules:
+            winners["smith"] = smith_set_mask(pairwise)
+        if "schwartz" in rules:
+            winners["schwartz"] = schwartz_set_mask(pairwise)
+
+    return winners
@@ -0,0 +1,216 @@
+"""
+Monte Carlo simulations on worker processes.
+"""
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+class SimulationStatistics:
+    """
+    A class used to aggregate the statistics returned by the trials of a
+    simulation (see run_simulation).
+
+    Attributes
+    ----------
+    num_trials: int
+        number of aggregated trials
+    sums: dict
+        sum of every statistic over the trials
+    sums_of_squares: dict
+        sum of the squares of every statistic over the trials
+
+    Methods
+    -------
+    add(statistics)
+    update(other)
+    copy()
+    mean()
+    standard_error()
+    """
+
+    def __init__(self):
+        self.num_trials = 0
+        self.sums = {}
+        self.sums_of_squares = {}
+
+    def add(self, statistics):
+        """
+        Adds the statistics of one trial: a dict of numbers (booleans count
+        as 0 or 1) or a single number, which is stored as "value".
+        """
+        if not isinstance(statistics, dict):
+            statistics = {"value": statistics}
+        self.num_trials += 1
+        for key, value in statistics.items():
+            value = float(value)
+            self.sums[key] = self.sums.get(key, 0.0) + value
+            self.sums_of_squares[key] = self.sums_of_squares.get(key, 0.0) \
+                + value * value
+
+    def update(self, other):
+        """
+        Adds the trials aggregated in another SimulationStatistics.
+        """
+        self.num_trials += other.num_trials
+        for key in other.sums:
+            self.sums[key] = self.sums.get(key, 0.0) + other.sums[key]
+            self.sums_of_squares[key] = self.sums_of_squares.get(key, 0.0) \
+                + other.sums_of_squares[key]
+
+    def copy(self):
+        """
+        Returns a new SimulationStatistics with the same trials.
+        """
+        statistics = SimulationStatistics()
+        statistics.update(self)
+        return statistics
+
+    def mean(self):
+        return {key: value / self.num_trials
+                for key, value in self.sums.items()}
+
+    def standard_error(self):
+        errors = {}
+        for key, mean in self.mean().items():
+            variance = max(0.0, self.sums_of_squares[key] / self.num_trials
+                           - mean * mean)
+            errors[key] = math.sqrt(variance / self.num_trials)
+        return errors
+
+    def __repr__(self):
+        return "SimulationStatistics(num_trials=" + str(self.num_trials) \
+            + ", mean=" + str(self.mean() if self.num_trials else {}) + ")"
+
+
+def run_simulation_chunk(trial, seed_sequence, num_trials):
+    """
+    run_simulation_chunk(trial, seed_sequence, num_trials)
+
+    Runs num_trials trials with random streams derived from seed_sequence
+    and returns their SimulationStatistics. This is the unit of work that
+    run_simulation hands to its worker processes.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    # Seed the global states as well, for generators that draw from them
+    legacy_seeds = seed_sequence.spawn(1)[0].generate_state(2)
+    np.random.seed(int(legacy_seeds[0]))
+    random.seed(int(legacy_seeds[1]))
+
+    statistics = SimulationStatistics()
+    for _ in range(num_trials):
+        statistics.add(trial(rng))
+    return statistics
+
+
+def iter_simulation(trial, num_trials, seed=None, num_workers=None,
+                    chunk_size=1000):
+    """
+    iter_simulation(trial, num_trials, seed=None, num_workers=None,
+                    chunk_size=1000)
+
+    Runs a simulation like run_simulation and yields the statistics of all
+    trials finished so far every time a chunk of trials finishes. The last
+    SimulationStatistics yielded is the final result.
+    """
+    num_chunks = -(-num_trials // chunk_size)
+    chunk_sizes = [min(chunk_size, num_trials - c * chunk_size)
+                   for c in range(num_chunks)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_chunks)
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    chunk_statistics = [None] * num_chunks
+    running = SimulationStatistics()
+
+    if num_workers == 1:
+        for c in range(num_chunks):
+            # The chunk seeds the global random states of this process, which
+            # are the caller's here, so they are restored afterwards
+            numpy_state = np.random.get_state()
+            random_state = random.getstate()
+            try:
+                statistics = run_simulation_chunk(trial, seed_sequences[c],
+                                                  chunk_sizes[c])
+            finally:
+                np.random.set_state(numpy_state)
+                random.setstate(random_state)
+            chunk_statistics[c] = statistics
+            running.update(statistics)
+            if c < num_chunks - 1:
+                yield running.copy()
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {executor.submit(run_simulation_chunk, trial,
+                                       seed_sequences[c], chunk_sizes[c]): c
+                       for c in range(num_chunks)}
+            for finished, future in enumerate(as_completed(futures)):
+                chunk_statistics[futures[future]] = future.result()
+                running.update(future.result())
+                if finished < num_chunks - 1:
+                    yield running.copy()
+
+    # Combine the chunks in a fixed order so that the floating point sums
+    # do not depend on the order in which the workers finished
+    result = SimulationStatistics()
+    for statistics in chunk_statistics:
+        result.update(statistics)
+    yield result
+
+
+def run_simulation(trial, num_trials, seed=None, num_workers=None,
+                   chunk_size=1000):
+    """
+    run_simulation(trial, num_trials, seed=None, num_workers=None,
+                   chunk_size=1000)
+
+    Runs num_trials independent trials of a Monte Carlo simulation on a pool
+    of worker processes and aggregates their statistics.
+
+    The trials are split into chunks of chunk_size trials. Every chunk gets
+    its own random stream spawned from numpy.random.SeedSequence(seed), and
+    the global random states are seeded from it before the chunk runs (and
+    restored afterwards when the chunk runs in the current process). The
+    result therefore only depends on seed and chunk_size, not on the number
+    of workers.
+
+    Parameters
+    ----------
+    trial: function
+        called as trial(rng) with a numpy.random.Generator; returns a dict
+        of numbers (or a single number). It must be picklable, i.e. defined
+        at the top level of a module (functools.partial of such a function
+        works as well)
+    num_trials: int
+        number of trials
+    seed: int, optional
+        seed of the simulation; fresh entropy by default
+    num_workers: int, optional
+        number of worker processes; os.cpu_count() by default, 1 runs the
+        trials in the current process
+    chunk_size: int
+        number of trials per chunk
+
+    Returns
+    -------
+    SimulationStatistics
+
+    Example
+    -------
+    def condorcet_winner_exists(rng):
+        profile = Profile()
+        profile.gen_uniform_voters(4, 25, rng=rng)
+        return {"condorcet": len(profile.condorcet()) > 0}
+
+    run_simulation(condorcet_winner_exists, 10000, seed=1).mean()
+    """
+    for statistics in iter_simulation(trial, num_trials, seed=seed,
+                                      num_workers=num_workers,
+                                      chunk_size=chunk_size):
+        pass
+    return statistics
@@ -0,0 +1,189 @@
+"""
+Helpers on candidate names and preference lists.
+"""
+
+import functools
+import itertools
+import shutil
+import string
+import sys
+from collections import Counter
+
+
+@functools.lru_cache(maxsize=None)
+def lexicographic_label(index):
+    """
+    lexicographic_label(index)
+
+    Returns the string at position index (from 0) of the lexicographically
+    ordered strings ["a", ..., "z", "aa", "ab", ...], i.e. index + 1 written
+    in bijective base 26 with the digits "a" to "z". The labels are cached
+    and interned, so that every profile shares the same string objects.
+
+    Parameters
+    ----------
+    index: int
+       position of the string
+
+    Returns
+    -------
+    str
+
+    Example
+    -------
+    lexicographic_label(27) # returns 'ab'
+    """
+    digits = []
+    number = index + 1
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        digits.append(string.ascii_lowercase[remainder])
+    return sys.intern("".join(reversed(digits)))
+
+
+def get_lexicographic_list(n):
+    """
+    get_lexicographic_list(n)
+
+    Returns a list that contains the first n lexicographically ordered strings
+        ["a", "b", "c", ..., "z", "aa", "ab", "ac", ...]
+
+    Parameters
+    ----------
+    n: int
+       number of strings
+
+    Returns
+    -------
+    list
+
+    Example
+    -------
+    get_lexicographic_list(3) # returns ['a','b','c']
+    """
+    return [lexicographic_label(index) for index in range(n)]
+
+
+def mode(elements):
+    """
+    mode(elements)
+
+    Returns the elements with highest number of occurrence.
+
+
+    Parameters
+    ----------
+    elements: list
+        a list of elements to be counted
+
+    Returns
+    -------
+    list
+
+    Example
+    -------
+    a = [1,1,2,3,3]
+    mode(a) # returns [1,3]
+    """
+    if not isinstance(elements, list):
+        raise TypeError("Not a list")
+
+    if not elements:
+        raise ValueError("Empty list provided")
+
+    counts = Counter(elements)
+    max_value = max(counts.values())
+    return sorted(key for key, value in counts.items() if value == max_value)
+
+
+def compare(numA, numB):
+    """
+    compare(numA, numB):
+
+    Compares two numbers. Returns:
+        1,  if the first number is greater than the second,
+        0,  if they are equal,
+       -1, if the first number is smaller than the second.
+
+    Parameters
+    ----------
+    numA: integer or float
+    numB: integer of float
+
+    Returns
+    -------
+    integer
+
+    """
+    if numA > numB:
+        return 1
+    if numA < numB:
+        return -1
+    if numA == numB:
+        return 0
+
+
+def convert_condensed(voters):
+    """
+    This functions gets a list of voters and convert in each voter preferences
+    in condensed string form.
+
+    Example:
+    list_of_voters = [["a","b","c","d"],["b","a","c","d"]]
+
+    convert_condensed(list_of_voters)
+    ## Output: ['abcd', 'bacd']
+    """
+    return ["".join(voter) for voter in voters]
+
+
+# This is nice, it might be useful
+# list(itertools.combinations(list("abcd"),4))
+
+
+def iter_preferences(candidates, concentrate=False):
+    """
+    Yields all possible preferences given a list of candidates, one at a
+    time, in the order of all_preferences
+    """
+    for permutation in itertools.permutations(candidates):
+        if concentrate:
+            yield "".join(permutation)
+        else:
+            yield list(permutation)
+
+
+def all_preferences(candidates, concentrate=False):
+    """
+    Generates all possible preferences given a list of candidates
+    """
+    return list(iter_preferences(candidates, concentrate=concentrate))
+
+
+@functools.lru_cache(maxsize=None)
+def terminal_size():
+    """
+    terminal_size()
+
+    Returns the size of the terminal as os.terminal_size(columns, lines),
+    read once per process without starting a subprocess. The COLUMNS and
+    LINES environment variables take precedence, and (80, 24) is used when
+    the output is not a terminal.
+    """
+    return shutil.get_terminal_size()
+
+
+def make_dictionary(pref1, pref2):
+    return dict(zip(pref1, pref2))
+
+
+def create_all_mappings(candidates):
+    # This creates al mappings from candidate lists.
+    # I will use it to generate candidate permutations
+    all_prefs = all_preferences(candidates)
+    list_of_mappings = []
+
+    for p in all_prefs:
+        list_of_mappings.append(make_dictionary(candidates, p))
+
+    return list_of_mappings
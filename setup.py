@@ -7,7 +7,7 @@ with open(path.join(here, 'README.md'), encoding='utf-8') as f:
 
 setuptools.setup(
     name='choicepy',
-    python_requires='>3.6.0',
+    python_requires='>=3.7',
     version='0.0.1a1',
     packages=['choicepy'],
     url='https://github.com/seyhunsaral/choicepy',
@@ -0,0 +1,20 @@
+import choicepy
+
+reference = ["a", "b", "c", "d"]
+rankings = [["a", "b", "c", "d"], ["b", "a", "d", "c"], ["d", "c", "b", "a"]]
+
+
+def test_ranking_distance_methods():
+    assert choicepy.ranking_distance(reference, rankings[1]) == 2
+    assert choicepy.ranking_distance(reference, rankings[2]) == 6
+    assert choicepy.ranking_distance(reference, rankings[2], "footrule") == 8
+    assert choicepy.ranking_distance(reference, rankings[2], "spearman") == 20
+    assert choicepy.ranking_distance(reference, rankings[1], "cayley") == 2
+    assert choicepy.ranking_distance([0, 1, 2], [2, 0, 1]) == 2
+
+
+def test_batched_ranking_distances():
+    for method in choicepy.RANKING_DISTANCE_METHODS:
+        distances = choicepy.ranking_distances(rankings, reference, method)
+        assert distances.tolist() == [
+            choicepy.ranking_distance(reference, r, method) for r in rankings]
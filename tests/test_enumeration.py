@@ -0,0 +1,100 @@
+import itertools
+
+import choicepy
+
+
+def test_all_profiles_order():
+    candidates = list("bca")
+    preferences = [list(p) for p in itertools.permutations(candidates)]
+    expected = [choicepy.Profile(list(p))
+                for p in itertools.product(preferences, repeat=2)]
+    assert choicepy.all_profiles(candidates, 2) == expected
+
+
+def test_sharded_profile_enumeration():
+    candidates = list("abc")
+    shards = choicepy.shard_profile_indices(candidates, 3, 4)
+    assert shards[0][0] == 0
+    assert shards[-1][1] == choicepy.count_profiles(candidates, 3) == 216
+
+    resumed = []
+    for start, stop in shards:
+        for chunk in choicepy.iter_profile_chunks(candidates, 3,
+                                                  chunk_size=7,
+                                                  start=start, stop=stop):
+            resumed.extend(chunk.tolist())
+    assert resumed == [p.get_voter_array().tolist()
+                       for p in choicepy.iter_profiles(candidates, 3)]
+
+
+def test_hashable_profiles_and_rankings():
+    voters = [list("abc"), list("bca"), list("abc")]
+    profile = choicepy.Profile(voters)
+    array_profile = choicepy.Profile()
+    array_profile.set_voter_array(profile.get_voter_array(), list("abc"))
+    assert hash(profile) == hash(array_profile)
+    assert len({profile, array_profile}) == 1
+
+    sorted_profile = choicepy.Profile(sorted(voters))
+    for other in [profile, sorted_profile, profile.to_anonymous()]:
+        anonymous_profile = sorted_profile.to_anonymous()
+        if anonymous_profile == other:
+            assert hash(anonymous_profile) == hash(other)
+        assert (other == anonymous_profile) == (anonymous_profile == other)
+    assert len({sorted_profile, sorted_profile.to_anonymous()}) == 2
+
+    generated = choicepy.Profile()
+    generated.gen_uniform_voters(30, 5, rng=2)
+    named = choicepy.Profile([generated.get_voter(v) for v in range(5)])
+    assert named.candidates != generated.candidates
+    assert generated == named and named == generated
+    assert hash(generated) == hash(named)
+    assert len(choicepy.filter_unique_profile([generated, named])) == 1
+    assert hash(generated.to_anonymous()) == hash(named.to_anonymous())
+    assert generated.to_anonymous() == named.to_anonymous()
+
+    assert choicepy.filter_unique(voters) == voters[:2]
+    permutations = profile.create_voter_permutations(with_myself=True)
+    assert len(permutations) == 3
+    assert len(choicepy.filter_unique_profile(permutations * 2)) == 3
+
+
+def test_orbit_representatives():
+    candidates = list("abc")
+    representatives = list(choicepy.iter_orbit_representatives(candidates,
+                                                                3))
+    assert sum(size for _, size in representatives) \
+        == choicepy.count_profiles(candidates, 3)
+
+    keys = {profile.get_key() for profile, _ in representatives}
+    for profile in choicepy.iter_profiles(candidates, 3):
+        assert profile.canonical_form().get_key() in keys
+
+    for profile, size in representatives:
+        assert profile.canonical_form() == profile
+        assert profile.orbit_size() == size
+
+
+def test_candidate_permutations():
+    profile = choicepy.Profile([list("abc"), list("bac"), list("abc")])
+    assert profile.rename_candidates({"a": "x", "b": "y", "c": "z"}) \
+        == [list("xyz"), list("yxz"), list("xyz")]
+
+    permutations = profile.create_candidate_permutations()
+    assert len(permutations) == 5
+    assert profile not in permutations
+    assert permutations[0].voters == [list("acb"), list("cab"), list("acb")]
+    assert profile.get_candidate_permutation_array().shape == (6, 3, 3)
+
+
+def test_lexicographic_list():
+    expected = ["".join(letters) for length in range(1, 4)
+                for letters in itertools.product("abcdefghijklmnopqrstuvwxyz",
+                                                 repeat=length)]
+    assert choicepy.get_lexicographic_list(len(expected)) == expected
+    assert choicepy.get_lexicographic_list(0) == []
+    assert choicepy.lexicographic_label(len(expected)) == "aaaa"
+
+    labels = choicepy.get_lexicographic_list(5000)
+    assert len(set(labels)) == 5000
+    assert choicepy.get_lexicographic_list(5000)[4999] is labels[4999]
@@ -1,3 +1,5 @@
+import numpy as np
+
 import choicepy
 
 my_profile = choicepy.Profile()
@@ -13,3 +15,105 @@ def test_uniform_generation_by_list_of_candidates():
     my_profile.gen_uniform_voters(list("abc"), 7)
     assert len(my_profile.candidates) == 3
     assert len(my_profile.voters) == 7
+
+
+def test_mallows_generation_for_many_candidates():
+    my_profile.gen_mallows_voters(30, 50, 0.5)
+    assert len(my_profile.candidates) == 30
+    assert len(my_profile.voters) == 50
+    assert all(set(voter) == set(my_profile.candidates)
+               for voter in my_profile.voters)
+
+
+def test_mallows_generation_around_reference():
+    my_profile.gen_mallows_voters(list("dcba"), 5, 0)
+    assert my_profile.voters == [list("dcba")] * 5
+
+
+def test_transformed_mallows_generation_for_many_candidates():
+    my_profile.gen_mallows_voters(15, 20, 0.9, 0.5)
+    assert len(my_profile.candidates) == 15
+    assert len(my_profile.voters) == 20
+
+
+def test_transformed_mallows_distance_distribution():
+    assert choicepy.mahonian_numbers(4) == (1, 3, 5, 6, 5, 3, 1)
+    _, probabilities, distances = choicepy.gen_trans_mallows_culture(
+        list("abcd"), 0.5, 0.7)
+    by_distance = choicepy.transformed_mallows_distance_distribution(4, 0.5,
+                                                                     0.7)
+    for d, p in enumerate(by_distance):
+        expected = sum(q for q, k in zip(probabilities, distances) if k == d)
+        assert abs(p - expected) < 1e-12
+
+
+def test_generation_with_explicit_rng():
+    other_profile = choicepy.Profile()
+    my_profile.gen_uniform_voters(list("abcd"), 20, rng=3)
+    other_profile.gen_uniform_voters(list("abcd"), 20, rng=3)
+    assert my_profile == other_profile
+
+    my_profile.gen_mistaken_truth_voters(list("dcba"), 20, 0.5, rng=4)
+    other_profile.gen_mistaken_truth_voters(list("dcba"), 20, 0.5, rng=4)
+    assert my_profile == other_profile
+
+    my_profile.gen_mistaken_truth_voters(list("dcba"), 5, 0)
+    assert my_profile.voters == [list("dcba")] * 5
+
+    np.random.seed(5)
+    my_profile.gen_mallows_voters(list("abcd"), 20, 0.5, 0.5)
+    np.random.seed(5)
+    other_profile.gen_mallows_voters(list("abcd"), 20, 0.5, 0.5)
+    assert my_profile == other_profile
+
+
+def test_statistical_cultures():
+    my_profile.gen_impartial_anonymous_voters(list("abcd"), 30, rng=1)
+    assert len(my_profile.voters) == 30
+
+    my_profile.gen_urn_voters(list("abcd"), 30, 0, rng=1)
+    assert len(my_profile.voters) == 30
+
+    my_profile.gen_urn_voters(list("abcd"), 30, 1000, rng=1)
+    assert len(my_profile.summarize_voters()) <= 3
+
+
+def test_single_peaked_generation():
+    axis = list("dbca")
+    for method in ["walsh", "conitzer"]:
+        my_profile.gen_single_peaked_voters(axis, 50, method, rng=2)
+        for voter in my_profile.voters:
+            positions = [voter.index(c) for c in axis]
+            peak = axis.index(voter[0])
+            assert positions[:peak + 1] == sorted(positions[:peak + 1],
+                                                  reverse=True)
+            assert positions[peak:] == sorted(positions[peak:])
+
+
+def test_euclidean_generation():
+    my_profile.gen_euclidean_voters(list("abc"), 2, 1,
+                                    voter_positions=[[0], [1]],
+                                    candidate_positions=[[0], [0.4], [1]])
+    assert my_profile.voters == [list("abc"), list("cba")]
+
+
+def test_estimate_mallows():
+    profile = choicepy.Profile()
+    profile.gen_mallows_voters(list("dacbe"), 20000, 0.6, rng=9)
+    reference_rank, dispersion_parameter = choicepy.estimate_mallows(profile)
+    assert reference_rank == list("dacbe")
+    assert abs(dispersion_parameter - 0.6) < 0.02
+
+    _, dispersion_parameter = choicepy.estimate_mallows(
+        profile.to_anonymous(), reference_rank)
+    assert abs(dispersion_parameter - 0.6) < 0.02
+
+    unanimous = choicepy.Profile([list("abc")] * 4)
+    assert choicepy.estimate_mallows(unanimous) == (list("abc"), 0.0)
+
+    rankings = choicepy.all_preferences(list("abcd"))
+    distances = [choicepy.ranking_distance(r, list("abcd"), "kendalltau")
+                 for r in rankings]
+    weights = [0.6 ** d for d in distances]
+    expected = sum(d * w for d, w in zip(distances, weights)) / sum(weights)
+    assert abs(choicepy.mallows_expected_distance(4, 0.6) - expected) < 1e-9
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import choicepy
+
+
+def test_package_import_is_lazy():
+    code = ("import sys, choicepy; "
+            "assert 'numpy' not in sys.modules; "
+            "assert 'choicepy.profile' not in sys.modules; "
+            "choicepy.ranking_distance; "
+            "assert 'choicepy.distances' in sys.modules; "
+            "assert 'choicepy.simulation' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_public_names_resolve():
+    for name in choicepy.__all__:
+        assert getattr(choicepy, name) is getattr(
+            getattr(choicepy, choicepy.NAME_SUBMODULES[name]), name)
+    assert set(choicepy.__all__) <= set(dir(choicepy))
+    assert choicepy.Profile().__class__.__module__ == "choicepy.profile"
@@ -0,0 +1,43 @@
+import choicepy
+
+
+def test_instrument_records_and_restores():
+    plurality = choicepy.Profile.plurality
+    sampler = choicepy.sample_uniform_rankings
+
+    with choicepy.instrument() as instrumentation:
+        profile = choicepy.Profile()
+        profile.gen_uniform_voters(4, 100, rng=1)
+        profile.plurality()
+        profile.elect("plurality")
+        assert choicepy.Profile.plurality is not plurality
+
+    assert choicepy.Profile.plurality is plurality
+    assert choicepy.sample_uniform_rankings is sampler
+    assert not instrumentation.is_enabled()
+
+    records = {record["name"]: record for record in instrumentation.report()}
+    assert records["Profile.plurality"]["calls"] == 2
+    assert records["Profile.elect"]["calls"] == 1
+    assert records["sample_uniform_rankings"]["calls"] == 1
+    assert records["sample_uniform_rankings"]["allocated_bytes"] > 0
+    assert records["Profile.gen_uniform_voters"]["seconds"] >= \
+        records["sample_uniform_rankings"]["seconds"]
+
+    profile.plurality()
+    records = {record["name"]: record for record in instrumentation.report()}
+    assert records["Profile.plurality"]["calls"] == 2
+
+
+def test_nested_instrument_keeps_outer_records():
+    with choicepy.instrument() as instrumentation:
+        profile = choicepy.Profile()
+        profile.gen_uniform_voters(4, 10, rng=1)
+        with choicepy.instrument():
+            profile.plurality()
+        assert instrumentation.is_enabled()
+        profile.plurality()
+
+    records = {record["name"]: record for record in instrumentation.report()}
+    assert records["Profile.gen_uniform_voters"]["calls"] == 1
+    assert records["Profile.plurality"]["calls"] == 2
@@ -0,0 +1,97 @@
+import numpy as np
+
+import choicepy
+
+
+def test_preflib_round_trip(tmp_path):
+    profile = choicepy.Profile()
+    profile.gen_mallows_voters(5, 200, 0.5, rng=1)
+    path = str(tmp_path / "profile.soc")
+    choicepy.write_preflib(profile, path, title="Mallows")
+
+    header = choicepy.read_preflib_header(path)
+    assert header["data type"] == "soc"
+    assert header["number voters"] == "200"
+
+    read_profile = choicepy.read_preflib(path)
+    assert sorted(map(tuple, read_profile.voters)) == \
+        sorted(map(tuple, profile.voters))
+    anonymous_profile = choicepy.read_preflib(path, anonymous=True)
+    assert anonymous_profile == profile.to_anonymous()
+
+
+def test_preflib_formats(tmp_path):
+    legacy = tmp_path / "legacy.soc"
+    legacy.write_text("3\n1,x\n2,y\n3,z\n5,5,2\n3,1,2,3\n2,3,2,1\n")
+    profile = choicepy.read_preflib(str(legacy))
+    assert profile.voters == [list("xyz")] * 3 + [list("zyx")] * 2
+
+    incomplete = tmp_path / "incomplete.soi"
+    incomplete.write_text("# DATA TYPE: soi\n"
+                          "# NUMBER ALTERNATIVES: 3\n"
+                          "# ALTERNATIVE NAME 1: x\n"
+                          "# ALTERNATIVE NAME 2: y\n"
+                          "# ALTERNATIVE NAME 3: z\n"
+                          "4: 2,1\n"
+                          "1: 3,1,2\n")
+    assert list(choicepy.iter_preflib_ballots(str(incomplete))) == \
+        [(4, ("y", "x")), (1, ("z", "x", "y"))]
+    try:
+        choicepy.read_preflib(str(incomplete))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("incomplete ballots must be rejected")
+
+
+def test_binary_profile_file(tmp_path):
+    profile = choicepy.Profile()
+    profile.gen_uniform_voters(30, 1000, rng=1)
+    path = str(tmp_path / "profile.choicepy")
+    choicepy.save_profile(profile, path)
+
+    loaded = choicepy.load_profile(path)
+    assert loaded == profile
+    assert loaded.candidates == profile.candidates
+    assert not loaded.get_voter_array().flags.writeable
+    assert loaded.plurality() == profile.plurality()
+    assert choicepy.load_profile(path, mmap=False) == profile
+
+    anonymous_profile = profile.to_anonymous()
+    choicepy.save_profile(anonymous_profile, path)
+    loaded = choicepy.load_profile(path)
+    assert isinstance(loaded, choicepy.AnonymousProfile)
+    assert loaded == anonymous_profile
+    assert np.array_equal(loaded.counts, anonymous_profile.counts)
+
+    numbered = choicepy.Profile()
+    numbered.set_voter_array([[0, 1, 2], [2, 1, 0]], list(np.arange(3)))
+    choicepy.save_profile(numbered, path)
+    assert choicepy.load_profile(path).candidates == [0, 1, 2]
+    assert choicepy.load_profile(path) == numbered
+
+    try:
+        choicepy.save_profile(choicepy.Profile(), path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("empty profiles must be rejected")
+
+
+def test_profile_rendering(capsys, monkeypatch):
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("rendering must not start a subprocess")
+    monkeypatch.setattr("os.popen", no_subprocess)
+
+    profile = choicepy.Profile([list("abc"), list("bca"), list("abc")])
+    table = "[0] [1] [2] \na   b   a   \nb   c   b   \nc   a   c   \n"
+    assert profile.profile_string_full() == table
+    assert str(profile) == ("3 candidates, 3 voters \n"
+                            "Profile: abc:2 | bca:1 | \n\n" + table)
+    assert profile.summarize_voters() == {"abc": 2, "bca": 1}
+    assert str(choicepy.Profile()) == "Empty profile"
+
+    profile.print_full()
+    assert capsys.readouterr().out == table
+    assert "".join(profile.iter_profile_string(2)) == \
+        "[0] [1] \na   b   \nb   c   \nc   a   \n\n[2] \na   \nb   \nc   \n"
@@ -7,3 +7,186 @@ my_profile.set_voters([["a", "b", "c"], ["a", "c", "b"], ["c", "b", "a"]])
 
 def test_plurality():
     assert my_profile.plurality() == ['a']
+
+
+def test_majority():
+    majority_profile = choicepy.Profile([["a", "b"], ["b", "a"], ["b", "a"]])
+    assert majority_profile.majority() == ['b']
+
+
+def test_rules_on_voter_array():
+    array_profile = choicepy.Profile()
+    array_profile.set_voter_array([[0, 1, 2], [0, 2, 1], [2, 1, 0]],
+                                  list("abc"))
+    assert array_profile == my_profile
+    assert array_profile.voters == my_profile.voters
+    for rule in ["plurality", "majority", "condorcet", "borda"]:
+        assert array_profile.elect(rule) == my_profile.elect(rule)
+    assert array_profile.approval(2) == ['a', 'b', 'c']
+
+
+def test_pairwise_rules():
+    cycle = choicepy.Profile([["a", "b", "c", "d"],
+                              ["b", "c", "a", "d"],
+                              ["c", "a", "b", "d"]])
+    assert cycle.get_pairwise_matrix()[0].tolist() == [0, 2, 1, 3]
+    assert cycle.condorcet() == []
+    assert cycle.copeland() == ['a', 'b', 'c']
+    assert cycle.smith_set() == ['a', 'b', 'c']
+    assert cycle.schwartz_set() == ['a', 'b', 'c']
+    assert my_profile.condorcet() == ['a']
+
+
+def test_anonymous_profile():
+    anonymous_profile = choicepy.AnonymousProfile(
+        [["a", "b", "c"], ["c", "b", "a"], ["a", "b", "c"]])
+    assert anonymous_profile.num_voters == 3
+    assert anonymous_profile.num_rankings == 2
+    assert anonymous_profile.counts.tolist() == [2, 1]
+    assert anonymous_profile.get_voter(-1) == anonymous_profile.voters[-1] \
+        == ["c", "b", "a"]
+    assert anonymous_profile.get_voter(-3) == ["a", "b", "c"]
+    for voter_index in [3, -4]:
+        try:
+            anonymous_profile.get_voter(voter_index)
+        except IndexError:
+            pass
+        else:
+            assert False
+
+    profile = anonymous_profile.to_profile()
+    assert choicepy.AnonymousProfile.from_profile(profile) == anonymous_profile
+    for rule in ["plurality", "majority", "condorcet", "borda", "copeland"]:
+        assert anonymous_profile.elect(rule) == profile.elect(rule)
+    assert anonymous_profile.approval(2) == profile.approval(2) == ['b']
+
+
+def test_anonymous_profile_with_many_numbered_candidates():
+    profile = choicepy.Profile()
+    profile.gen_uniform_voters(30, 4, rng=1)
+    anonymous_profile = profile.to_anonymous()
+    assert anonymous_profile.candidates == profile.candidates
+    assert anonymous_profile.plurality() == profile.plurality()
+    assert sorted(anonymous_profile.to_profile().voters) == \
+        sorted(profile.voters)
+
+    unsorted = choicepy.Profile()
+    unsorted.candidates = list("cab")
+    unsorted.num_candidates = 3
+    unsorted.set_voter_array([[0, 1, 2], [2, 0, 1]])
+    relabelled = unsorted.create_candidate_permutations(with_myself=True)
+    assert relabelled[0].voters == unsorted.voters
+    assert unsorted.canonical_form().candidates == list("cab")
+
+
+def test_elect_batch():
+    profile_array = [[[0, 1, 2], [0, 2, 1], [2, 1, 0]],
+                     [[0, 1, 2], [1, 2, 0], [2, 0, 1]]]
+    winners = choicepy.elect_batch(profile_array)
+    for i, voter_array in enumerate(profile_array):
+        profile = choicepy.Profile()
+        profile.set_voter_array(voter_array, list("abc"))
+        for rule in ["plurality", "majority", "condorcet", "borda",
+                     "copeland", "smith", "schwartz"]:
+            assert choicepy.select_candidates(winners[rule][i],
+                                              profile.candidates) \
+                == profile.elect(rule)
+
+
+def test_incremental_profile():
+    profile = choicepy.Profile()
+    profile.gen_mallows_voters(5, 300, 0.7, rng=2)
+    rules = ["plurality", "majority", "borda", "condorcet", "copeland",
+             "smith", "schwartz"]
+
+    incremental = choicepy.IncrementalProfile(candidates=5)
+    for voter in profile.voters:
+        incremental.add_voter(voter)
+    assert incremental == profile.to_anonymous()
+    for rule in rules:
+        assert incremental.elect(rule) == profile.elect(rule)
+
+    for voter in profile.voters[:100]:
+        incremental.remove_voter(voter)
+    remaining = choicepy.Profile(profile.voters[100:])
+    assert incremental.num_voters == 200
+    assert (incremental.get_pairwise_matrix()
+            == remaining.get_pairwise_matrix()).all()
+    for rule in rules:
+        assert incremental.elect(rule) == remaining.elect(rule)
+
+    try:
+        incremental.remove_voter(list("edcba"), count=1000)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("removing absent voters must fail")
+
+    for voter in profile.voters[100:]:
+        incremental.remove_voter(voter)
+    assert incremental.num_voters == 0
+    assert incremental.plurality() == incremental.majority() == []
+
+    relabelled = choicepy.IncrementalProfile([list("ab"), list("ba"),
+                                              list("ab")])
+    relabelled.set_candidates(list("xy"))
+    assert relabelled.num_voters == 0
+    assert not relabelled.voters
+    assert relabelled.plurality() == []
+    relabelled.add_voter(list("yx"))
+    assert relabelled.voters == [list("yx")]
+    assert relabelled.plurality() == ["y"]
+
+
+def test_elect_many_shares_cached_statistics():
+    profile = choicepy.Profile()
+    profile.gen_mallows_voters(6, 400, 0.8, rng=4)
+    rules = ["plurality", "majority", "borda", "condorcet", "copeland",
+             "smith", "schwartz"]
+    winners = profile.elect_many(rules)
+    assert winners == {rule: profile.elect(rule) for rule in rules}
+    assert profile.get_pairwise_matrix() is profile.get_pairwise_matrix()
+
+    first_place_counts = profile.get_first_place_counts()
+    profile.gen_uniform_voters(6, 400, rng=5)
+    assert profile.get_first_place_counts() is not first_place_counts
+    assert profile.elect_many(["plurality"]) == \
+        {"plurality": profile.plurality()}
+
+    try:
+        profile.elect_many(["plurality", "unknown"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown rules must be rejected")
+
+
+def test_positional_score_table():
+    profile = choicepy.Profile()
+    profile.gen_mallows_voters(6, 300, 0.8, rng=6)
+    positions = profile.get_position_array()
+
+    table = profile.get_score_table(choicepy.approval_scoring_matrix(6))
+    for k in range(1, 6):
+        assert (table[k - 1] == (positions < k).sum(axis=0)).all()
+
+    rules = ["plurality", "veto", "borda_0", "dowdall", [3, 2, 1, 1, 0, 0]]
+    table = profile.get_score_table(rules)
+    for rule, scores in zip(rules, table):
+        points = choicepy.scoring_vector(rule, 6)
+        assert (abs(scores - points[positions].sum(axis=0)) < 1e-9).all()
+    assert profile.gen_borda_rule("veto") == [1, 1, 1, 1, 1, 0]
+
+
+def test_kemeny():
+    profile = choicepy.Profile([list("abcd"), list("bcad"), list("cabd"),
+                                list("abdc"), list("bacd")])
+    best = min(choicepy.all_preferences(profile.candidates),
+               key=lambda ranking: sum(
+                   choicepy.ranking_distance(ranking, voter, "kendalltau")
+                   for voter in profile.voters))
+    assert profile.kemeny_ranking() == best == list("abcd")
+    assert profile.elect("kemeny") == ["a"]
+
+    cycle = choicepy.Profile([list("abc"), list("bca"), list("cab")])
+    assert cycle.kemeny() == ["a", "b", "c"]
@@ -0,0 +1,42 @@
+import random
+
+import numpy as np
+
+import choicepy
+
+
+def condorcet_winner_exists(rng):
+    profile = choicepy.Profile()
+    profile.gen_uniform_voters(4, 5, rng=rng)
+    return {"condorcet": len(profile.condorcet()) > 0,
+            "noise": rng.random()}
+
+
+def test_simulation_is_reproducible_across_workers():
+    serial = choicepy.run_simulation(condorcet_winner_exists, 50, seed=7,
+                                     num_workers=1, chunk_size=8)
+    parallel = choicepy.run_simulation(condorcet_winner_exists, 50, seed=7,
+                                       num_workers=2, chunk_size=8)
+    assert serial.num_trials == parallel.num_trials == 50
+    assert serial.sums == parallel.sums
+    assert 0 < serial.mean()["condorcet"] <= 1
+
+
+def test_simulation_streams_statistics():
+    progress = [statistics.num_trials for statistics in
+                list(choicepy.iter_simulation(condorcet_winner_exists, 10,
+                                              seed=1, num_workers=1,
+                                              chunk_size=4))]
+    assert progress == [4, 8, 10]
+
+
+def test_simulation_keeps_global_random_states():
+    np.random.seed(3)
+    random.seed(3)
+    expected = (np.random.random_sample(), random.random())
+
+    np.random.seed(3)
+    random.seed(3)
+    choicepy.run_simulation(condorcet_winner_exists, 10, seed=1,
+                            num_workers=1, chunk_size=4)
+    assert (np.random.random_sample(), random.random()) == expected